@@ -1,22 +1,99 @@
 """
 Blockchain Module - Handles all Web3 interactions with Monad Testnet
 """
+import os
+import json
+import logging
 import time
-from typing import Dict, List, Optional, Tuple
-from decimal import Decimal
-from web3 import Web3
+import asyncio
+import shelve
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+from typing import AsyncIterator, Dict, List, Optional, Tuple, Union
+from decimal import Decimal, InvalidOperation
+from web3 import Web3, AsyncWeb3, AsyncHTTPProvider
+from web3.contract import AsyncContract, Contract
 from web3.exceptions import ContractLogicError
 from eth_account import Account
+from eth_account.signers.local import LocalAccount
+from eth_abi import decode as abi_decode, encode as abi_encode
+import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from config import (
     MONAD_TESTNET_RPC_URL, DEX_ROUTER_ADDRESS, ERC20_ABI, 
     DEX_ROUTER_ABI, WETH_ADDRESS, NATIVE_CURRENCY, CHAIN_ID,
     GAS_PRICE_MODES, BLOCK_EXPLORER_API_URL, BLOCK_EXPLORER_API_KEY,
     BLOCKVISION_API_KEY, ALCHEMY_MONAD_URL,
-    VERIFIED_TOKENS, HIGH_VALUE_TOKENS  # Import from config (80 tokens!)
+    MULTICALL3_ADDRESS, MULTICALL3_ABI, MULTICALL_BATCH_SIZE, TOKEN_FETCH_WORKERS,
+    TOKEN_META_CACHE_PATH, GECKOTERMINAL_TOKEN_URLS, RPC_POOL_SIZE, RPC_TIMEOUT,
+    PRICE_CACHE_TTL, ERC20_TRANSFER_GAS, NATIVE_TRANSFER_GAS, GAS_ESTIMATE_MULTIPLIER,
+    HIGH_VALUE_TOKENS, VERIFIED_TOKENS_CHECKSUM  # Import from config (80 tokens!)
 )
 
+logger = logging.getLogger(__name__)
+
+# eth_keys signs with libsecp256k1 when coincurve is importable, otherwise with a pure-Python fallback
+try:
+    import coincurve  # noqa: F401
+except ImportError:
+    logger.warning("coincurve not installed, transaction signing uses the slow pure-Python backend")
+
+# Token verification lookups (built once, O(1) membership)
+_VERIFIED_TOKENS_LOWER = frozenset(address.lower() for address in VERIFIED_TOKENS_CHECKSUM)
+_HIGH_VALUE_TOKENS = frozenset(HIGH_VALUE_TOKENS)
+_STABLECOINS = frozenset({'USDT', 'USDC', 'DAI', 'BUSD', 'FRAX', 'R2USD'})
+
+# Balance strings from token APIs that are zero without parsing them
+_ZERO_BALANCE_STRINGS = frozenset({'', '0', '0.0'})
+
+# transfer(address,uint256) selector, transfer calldata is built directly without the contract ABI
+_TRANSFER_SELECTOR = bytes(Web3.keccak(text='transfer(address,uint256)')[:4])
+
+# balanceOf(address) selector, one calldata per wallet is shared by every token in a multicall
+_BALANCE_OF_SELECTOR = bytes(Web3.keccak(text='balanceOf(address)')[:4])
+
+# 10**n for every possible ERC20 decimals value (uint8), so balance scaling is a lookup
+_POW10_INT = tuple(10 ** i for i in range(256))
+_POW10_DEC = tuple(Decimal(10) ** i for i in range(256))
+
+@lru_cache(maxsize=8192)
+def _cs(address: str) -> str:
+    """Checksum an address (memoized - to_checksum_address hashes with keccak every call)"""
+    return Web3.to_checksum_address(address)
+
+@lru_cache(maxsize=4096)
+def _checksum_or_none(address: str) -> Optional[str]:
+    """Validate + checksum an address (memoized - mixed-case validation also hashes with keccak)"""
+    try:
+        if not Web3.is_address(address):
+            return None
+    except Exception:
+        return None
+    return _cs(address)
+
+def _build_rpc_session() -> requests.Session:
+    """
+    Build a keep-alive HTTP session for RPC calls
+    Pool is sized for the parallel token fetch fallback, transient errors are retried
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.2,
+        status_forcelist=[429, 502, 503, 504],
+        allowed_methods=frozenset(['POST'])  # JSON-RPC is always POST
+    )
+    adapter = HTTPAdapter(pool_connections=RPC_POOL_SIZE, pool_maxsize=RPC_POOL_SIZE, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
 class BlockchainManager:
     """Manages all blockchain interactions"""
     
@@ -25,15 +102,380 @@ class BlockchainManager:
         if not MONAD_TESTNET_RPC_URL:
             raise ValueError("MONAD_TESTNET_RPC_URL not configured")
         
-        self.w3 = Web3(Web3.HTTPProvider(MONAD_TESTNET_RPC_URL))
+        self.rpc_session = _build_rpc_session()
+        self.w3 = Web3(Web3.HTTPProvider(
+            MONAD_TESTNET_RPC_URL,
+            request_kwargs={'timeout': RPC_TIMEOUT},
+            session=self.rpc_session
+        ))
+        
+        # Async client for concurrent reads from async handlers (many in-flight eth_calls)
+        self.aw3 = AsyncWeb3(AsyncHTTPProvider(
+            MONAD_TESTNET_RPC_URL,
+            request_kwargs={'timeout': aiohttp.ClientTimeout(total=RPC_TIMEOUT)}
+        ))
         
         if not self.w3.is_connected():
             raise Exception(f"Failed to connect to Monad Testnet RPC: {MONAD_TESTNET_RPC_URL}")
         
         self.router_contract = self.w3.eth.contract(
-            address=Web3.to_checksum_address(DEX_ROUTER_ADDRESS),
+            address=_cs(DEX_ROUTER_ADDRESS),
             abi=DEX_ROUTER_ABI
         )
+        
+        self.multicall_contract = self.w3.eth.contract(
+            address=_cs(MULTICALL3_ADDRESS),
+            abi=MULTICALL3_ABI
+        )
+        
+        # Gas modes converted from gwei to wei once (used by every TX builder)
+        self._gas_params_wei = {
+            mode: {
+                'maxFeePerGas': Web3.to_wei(params['maxFeePerGas'], 'gwei'),
+                'maxPriorityFeePerGas': Web3.to_wei(params['maxPriorityFeePerGas'], 'gwei')
+            }
+            for mode, params in GAS_PRICE_MODES.items()
+        }
+        
+        # ERC20 contract classes: the ABI is normalized once here, per-address instances
+        # are created from them (also used address-less to encode multicall calldata)
+        self.erc20_factory = self.w3.eth.contract(abi=ERC20_ABI)
+        self.async_erc20_factory = self.aw3.eth.contract(abi=ERC20_ABI)
+        
+        # name()/symbol()/decimals() calldata is just the selector, same for every token
+        self._erc20_meta_call_data = {
+            fn_name: self.erc20_factory.encodeABI(fn_name=fn_name)
+            for fn_name in ('name', 'symbol', 'decimals')
+        }
+        
+        # ERC20 Contract objects by checksum address
+        self._erc20_cache: Dict[str, Contract] = {}
+        self._async_erc20_cache: Dict[str, AsyncContract] = {}
+        
+        # Background event loop for async HTTP (price APIs), with one reused session
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, name='blockchain-async', daemon=True).start()
+        self._http_session: Optional[aiohttp.ClientSession] = None
+        
+        # ERC20 name/symbol/decimals never change, cache them in memory and on disk
+        self._token_info_cache: Dict[str, Dict] = {}
+        self._token_info_lock = threading.Lock()
+        try:
+            self._token_meta_db = shelve.open(TOKEN_META_CACHE_PATH)
+        except Exception as e:
+            print(f"⚠️ Token metadata cache unavailable, using memory only: {e}")
+            self._token_meta_db = None
+        
+        # Prices move every few seconds at most: (kind, token) -> (price, fetched_at)
+        self._price_cache: Dict[Tuple[str, str], Tuple[Decimal, float]] = {}
+        
+        # ERC20 decimals by checksum address (immutable, never invalidated)
+        # WMON wraps the native coin, so its 18 decimals are known up front
+        self._decimals_cache: Dict[str, int] = {_cs(WETH_ADDRESS): 18}
+        
+        # Next nonce per sender, read at the start of each buy/sell/send then incremented locally
+        self._nonce_cache: Dict[str, int] = {}
+        self._nonce_lock = threading.Lock()
+        
+        # Load decimals of every verified token with one multicall, off the startup path
+        threading.Thread(target=self._prewarm_decimals, name='decimals-prewarm', daemon=True).start()
+    
+    def _erc20(self, checksum_address: str) -> Contract:
+        """Get the ERC20 contract for a checksum address, created once and reused"""
+        contract = self._erc20_cache.get(checksum_address)
+        if contract is None:
+            contract = self.erc20_factory(address=checksum_address)
+            self._erc20_cache[checksum_address] = contract
+        return contract
+    
+    def _aerc20(self, checksum_address: str) -> AsyncContract:
+        """Async counterpart of _erc20()"""
+        contract = self._async_erc20_cache.get(checksum_address)
+        if contract is None:
+            contract = self.async_erc20_factory(address=checksum_address)
+            self._async_erc20_cache[checksum_address] = contract
+        return contract
+    
+    def _get_cached_token_info(self, token_address: str) -> Optional[Dict]:
+        """Get cached token metadata (name, symbol, decimals) or None"""
+        key = f"{CHAIN_ID}:{token_address.lower()}"
+        
+        info = self._token_info_cache.get(key)
+        if info is None and self._token_meta_db is not None:
+            with self._token_info_lock:
+                info = self._token_meta_db.get(key)
+            if info is not None:
+                self._token_info_cache[key] = info
+        return info
+    
+    def _cache_token_info(self, token_address: str, info: Dict):
+        """Store token metadata in memory and on disk (never invalidated)"""
+        key = f"{CHAIN_ID}:{token_address.lower()}"
+        meta = {
+            'name': info['name'],
+            'symbol': info['symbol'],
+            'decimals': info['decimals']
+        }
+        
+        self._token_info_cache[key] = meta
+        if self._token_meta_db is not None:
+            with self._token_info_lock:
+                try:
+                    self._token_meta_db[key] = meta
+                except Exception as e:
+                    print(f"⚠️ Failed to persist token metadata: {e}")
+    
+    def _known_decimals(self, checksum_token: str) -> Optional[int]:
+        """Get token decimals from the decimals or metadata caches (no RPC) or None"""
+        decimals = self._decimals_cache.get(checksum_token)
+        if decimals is None:
+            info = self._get_cached_token_info(checksum_token)
+            if info:
+                decimals = info['decimals']
+                self._decimals_cache[checksum_token] = decimals
+        if decimals is None and self._token_meta_db is not None:
+            with self._token_info_lock:
+                decimals = self._token_meta_db.get(f"{CHAIN_ID}:decimals:{checksum_token.lower()}")
+            if decimals is not None:
+                self._decimals_cache[checksum_token] = decimals
+        return decimals
+    
+    def _cache_decimals(self, checksum_token: str, decimals: int):
+        """Store token decimals in memory and on disk so restarts skip the RPC"""
+        if self._decimals_cache.get(checksum_token) == decimals:
+            return  # Already known, no disk write
+        self._decimals_cache[checksum_token] = decimals
+        if self._token_meta_db is not None:
+            with self._token_info_lock:
+                try:
+                    self._token_meta_db[f"{CHAIN_ID}:decimals:{checksum_token.lower()}"] = decimals
+                except Exception as e:
+                    print(f"⚠️ Failed to persist token decimals: {e}")
+    
+    def _get_decimals(self, checksum_token: str) -> int:
+        """Get token decimals, calling decimals() only the first time a token is seen"""
+        decimals = self._known_decimals(checksum_token)
+        if decimals is None:
+            decimals = self._erc20(checksum_token).functions.decimals().call()
+            self._cache_decimals(checksum_token, decimals)
+        return decimals
+    
+    def _prewarm_decimals(self):
+        """Fill the decimals cache for all VERIFIED_TOKENS with a single multicall (skipped once persisted)"""
+        try:
+            checksum_tokens = [
+                checksum_token for checksum_token in VERIFIED_TOKENS_CHECKSUM
+                if self._known_decimals(checksum_token) is None
+            ]
+            if not checksum_tokens:
+                return
+            
+            decimals_data = self._erc20_meta_call_data['decimals']
+            results = self._multicall([(checksum_token, decimals_data) for checksum_token in checksum_tokens])
+            
+            for checksum_token, (success, return_data) in zip(checksum_tokens, results):
+                if success and return_data:
+                    self._cache_decimals(checksum_token, abi_decode(['uint8'], return_data)[0])
+        except Exception as e:
+            print(f"⚠️ Decimals prewarm failed: {e}")
+    
+    def _multicall(self, calls: List[Tuple[str, str]]) -> List[Tuple[bool, bytes]]:
+        """
+        Execute many read-only calls in one eth_call via Multicall3 aggregate3
+        
+        Args:
+            calls: List of (target checksum address, hex calldata)
+            
+        Returns:
+            List of (success, returnData) in the same order as calls
+        """
+        results = []
+        for start in range(0, len(calls), MULTICALL_BATCH_SIZE):
+            chunk = [
+                (target, True, call_data)
+                for target, call_data in calls[start:start + MULTICALL_BATCH_SIZE]
+            ]
+            results.extend(self.multicall_contract.functions.aggregate3(chunk).call())
+        return results
+    
+    def _batch_rpc(self, requests_: List[Tuple[str, list]]) -> List[Dict]:
+        """
+        Send many JSON-RPC requests in one HTTP round trip
+        
+        Args:
+            requests_: List of (method, params)
+            
+        Returns:
+            Raw response objects (with 'result' or 'error') in the same order as requests_
+        """
+        payload = [
+            {"jsonrpc": "2.0", "id": i, "method": method, "params": params}
+            for i, (method, params) in enumerate(requests_)
+        ]
+        
+        response = self.rpc_session.post(MONAD_TESTNET_RPC_URL, json=payload, timeout=RPC_TIMEOUT)
+        response.raise_for_status()
+        
+        # Batch responses may come back in any order, match them by id
+        by_id = {item.get('id'): item for item in response.json()}
+        return [by_id.get(i, {}) for i in range(len(requests_))]
+    
+    def _batch_eth_call(self, calls: List[Tuple[str, str]]) -> List[Tuple[bool, bytes]]:
+        """
+        Execute many eth_calls in one HTTP round trip using a JSON-RPC batch
+        Used when Multicall3 is not available on the RPC
+        
+        Args:
+            calls: List of (target checksum address, hex calldata)
+            
+        Returns:
+            List of (success, returnData) in the same order as calls
+        """
+        items = self._batch_rpc([
+            ("eth_call", [{"to": target, "data": call_data}, "latest"])
+            for target, call_data in calls
+        ])
+        
+        results = []
+        for item in items:
+            if 'result' in item:
+                results.append((True, Web3.to_bytes(hexstr=item['result'])))
+            else:
+                results.append((False, b''))
+        return results
+    
+    def _fetch_token_rows(self, wallet_address: str, token_addresses: List[str]) -> List[Dict]:
+        """
+        Read name, symbol, decimals and balance for many tokens in one round trip
+        Tries Multicall3 first, then a JSON-RPC batch of plain eth_calls
+        
+        Args:
+            wallet_address: Wallet address
+            token_addresses: List of token addresses
+            
+        Returns:
+            List of dicts with token info and balance (tokens that failed to read are skipped)
+        """
+        if not token_addresses:
+            return []
+        
+        try:
+            checksum_wallet = _cs(wallet_address)
+            checksum_tokens = [_cs(addr) for addr in token_addresses]
+        except Exception as e:
+            print(f"Error processing token addresses: {e}")
+            return []
+        
+        name_data = self._erc20_meta_call_data['name']
+        symbol_data = self._erc20_meta_call_data['symbol']
+        decimals_data = self._erc20_meta_call_data['decimals']
+        balance_data = '0x' + (_BALANCE_OF_SELECTOR + abi_encode(['address'], [checksum_wallet])).hex()
+        
+        # Metadata is read only for tokens not in the cache, balance for every token
+        calls = []
+        plan = []  # (token_address, cached info or None, index of first call)
+        for token_address, checksum_token in zip(token_addresses, checksum_tokens):
+            cached_info = self._get_cached_token_info(token_address)
+            plan.append((token_address, cached_info, len(calls)))
+            if cached_info is None:
+                calls.append((checksum_token, name_data))
+                calls.append((checksum_token, symbol_data))
+                calls.append((checksum_token, decimals_data))
+            calls.append((checksum_token, balance_data))
+        
+        # All reads are sent together (same block for every token)
+        try:
+            results = self._multicall(calls)
+        except Exception as e:
+            print(f"⚠️ Multicall3 failed, falling back to JSON-RPC batch: {e}")
+            try:
+                results = self._batch_eth_call(calls)
+            except Exception as e:
+                print(f"⚠️ JSON-RPC batch failed, falling back to per-token calls: {e}")
+                return self._fetch_token_rows_parallel(wallet_address, token_addresses)
+        
+        rows = []
+        
+        for token_address, cached_info, first in plan:
+            try:
+                call_count = 1 if cached_info else 4
+                token_results = results[first:first + call_count]
+                
+                # Skip tokens where any read reverted (not a standard ERC20)
+                if not all(success for success, _ in token_results):
+                    continue
+                
+                if cached_info:
+                    info = cached_info
+                else:
+                    name_raw, symbol_raw, decimals_raw = (data for _, data in token_results[:3])
+                    info = {
+                        'name': abi_decode(['string'], name_raw)[0],
+                        'symbol': abi_decode(['string'], symbol_raw)[0],
+                        'decimals': abi_decode(['uint8'], decimals_raw)[0]
+                    }
+                    self._cache_token_info(token_address, info)
+                
+                balance_wei = abi_decode(['uint256'], token_results[-1][1])[0]
+                
+                rows.append({
+                    'address': token_address,
+                    'name': info['name'],
+                    'symbol': info['symbol'],
+                    'decimals': info['decimals'],
+                    'balance': Decimal(balance_wei) / _POW10_DEC[info['decimals']]
+                })
+            except Exception as e:
+                print(f"Error processing token {token_address}: {e}")
+                continue
+        
+        return rows
+    
+    def _fetch_token_row(self, token_address: str, wallet_address: str) -> Optional[Dict]:
+        """Read info + balance for a single token (per-token fallback path)"""
+        info = self.get_token_info(token_address)
+        if not info:
+            return None
+        
+        balance, _ = self.get_token_balance(token_address, wallet_address)
+        
+        return {
+            'address': token_address,
+            'name': info['name'],
+            'symbol': info['symbol'],
+            'decimals': info['decimals'],
+            'balance': balance
+        }
+    
+    def _fetch_token_rows_parallel(self, wallet_address: str, token_addresses: List[str]) -> List[Dict]:
+        """
+        Read info + balance for many tokens with one thread per in-flight token
+        RPC calls are network-bound so threads overlap the waits
+        
+        Args:
+            wallet_address: Wallet address
+            token_addresses: List of token addresses
+            
+        Returns:
+            List of dicts with token info and balance, in input order
+        """
+        rows_by_address = {}
+        
+        with ThreadPoolExecutor(max_workers=TOKEN_FETCH_WORKERS) as executor:
+            futures = {
+                executor.submit(self._fetch_token_row, token_address, wallet_address): token_address
+                for token_address in token_addresses
+            }
+            for future in as_completed(futures):
+                token_address = futures[future]
+                try:
+                    row = future.result()
+                    if row:
+                        rows_by_address[token_address] = row
+                except Exception as e:
+                    print(f"Error processing token {token_address}: {e}")
+        
+        return [rows_by_address[addr] for addr in token_addresses if addr in rows_by_address]
     
     def _is_token_verified(self, token_address: str, symbol: str) -> bool:
         """
@@ -46,17 +488,14 @@ class BlockchainManager:
         Returns:
             True if verified, False otherwise
         """
-        # Check if in verified list
-        if token_address.lower() in VERIFIED_TOKENS:
-            return True
-        
-        # Check if symbol matches known high-value tokens
-        if symbol in HIGH_VALUE_TOKENS:
+        # Check if in verified list, a known high-value symbol, or a stablecoin (usually safe)
+        if (token_address.lower() in _VERIFIED_TOKENS_LOWER
+                or symbol in _HIGH_VALUE_TOKENS
+                or symbol in _STABLECOINS):
             return True
         
-        # Check if it's a stablecoin (usually safe)
-        stablecoins = ['USDT', 'USDC', 'DAI', 'BUSD', 'FRAX', 'R2USD']
-        if symbol in stablecoins or symbol.endswith('.a'):  # .a = Atlantis versions
+        # .a = Atlantis versions
+        if symbol.endswith('.a'):
             return True
         
         # Otherwise not verified
@@ -79,6 +518,10 @@ class BlockchainManager:
         except:
             return False
     
+    def checksum_address(self, address: str) -> Optional[str]:
+        """Validate an address and return its checksum form (memoized), or None if invalid"""
+        return _checksum_or_none(address)
+    
     def validate_private_key(self, private_key: str) -> Optional[str]:
         """
         Validate private key and return address if valid
@@ -109,7 +552,7 @@ class BlockchainManager:
             Balance in MONAD (Decimal)
         """
         try:
-            checksum_address = Web3.to_checksum_address(address)
+            checksum_address = _cs(address)
             balance_wei = self.w3.eth.get_balance(checksum_address)
             balance_monad = Decimal(self.w3.from_wei(balance_wei, 'ether'))
             return balance_monad
@@ -127,24 +570,51 @@ class BlockchainManager:
         Returns:
             Dict with token info or None if error
         """
+        cached_info = self._get_cached_token_info(token_address)
+        if cached_info:
+            return {'address': token_address, **cached_info}
+        
         try:
-            checksum_address = Web3.to_checksum_address(token_address)
-            token_contract = self.w3.eth.contract(address=checksum_address, abi=ERC20_ABI)
+            checksum_address = _cs(token_address)
+            token_contract = self._erc20(checksum_address)
             
             name = token_contract.functions.name().call()
             symbol = token_contract.functions.symbol().call()
             decimals = token_contract.functions.decimals().call()
             
-            return {
+            info = {
                 'address': token_address,
                 'name': name,
                 'symbol': symbol,
                 'decimals': decimals
             }
+            self._cache_token_info(token_address, info)
+            
+            return info
         except Exception as e:
             print(f"Error getting token info for {token_address}: {e}")
             return None
     
+    def get_token_balance_wei(self, token_address: str, wallet_address: str) -> Tuple[int, int]:
+        """
+        Get raw ERC-20 token balance (smallest unit, no Decimal conversion)
+        
+        Args:
+            token_address: Token contract address
+            wallet_address: Wallet address
+            
+        Returns:
+            Tuple of (balance in wei, decimals)
+        """
+        checksum_token = _cs(token_address)
+        checksum_wallet = _cs(wallet_address)
+        
+        token_contract = self._erc20(checksum_token)
+        balance_raw = token_contract.functions.balanceOf(checksum_wallet).call()
+        decimals = self._get_decimals(checksum_token)
+        
+        return balance_raw, decimals
+    
     def get_token_balance(self, token_address: str, wallet_address: str) -> Tuple[Decimal, int]:
         """
         Get ERC-20 token balance
@@ -157,14 +627,9 @@ class BlockchainManager:
             Tuple of (balance as Decimal, decimals)
         """
         try:
-            checksum_token = Web3.to_checksum_address(token_address)
-            checksum_wallet = Web3.to_checksum_address(wallet_address)
-            
-            token_contract = self.w3.eth.contract(address=checksum_token, abi=ERC20_ABI)
-            balance_raw = token_contract.functions.balanceOf(checksum_wallet).call()
-            decimals = token_contract.functions.decimals().call()
+            balance_raw, decimals = self.get_token_balance_wei(token_address, wallet_address)
             
-            balance = Decimal(balance_raw) / Decimal(10 ** decimals)
+            balance = Decimal(balance_raw) / _POW10_DEC[decimals]
             return balance, decimals
         except Exception as e:
             print(f"Error getting token balance: {e}")
@@ -181,125 +646,217 @@ class BlockchainManager:
         Returns:
             List of dicts with token info and balance
         """
-        balances = []
+        rows = self._fetch_token_rows(wallet_address, token_addresses)
+        return [row for row in rows if row['balance'] > 0]
+    
+    async def aget_token_info(self, token_address: str) -> Optional[Dict]:
+        """
+        Async version of get_token_info (name, symbol, decimals read concurrently)
         
-        for token_address in token_addresses:
-            try:
-                info = self.get_token_info(token_address)
-                if not info:
-                    continue
-                
-                balance, _ = self.get_token_balance(token_address, wallet_address)
-                
-                if balance > 0:
-                    balances.append({
-                        'address': token_address,
-                        'name': info['name'],
-                        'symbol': info['symbol'],
-                        'decimals': info['decimals'],
-                        'balance': balance
-                    })
-            except Exception as e:
-                print(f"Error processing token {token_address}: {e}")
-                continue
+        Args:
+            token_address: Token contract address
+            
+        Returns:
+            Dict with token info or None if error
+        """
+        cached_info = self._get_cached_token_info(token_address)
+        if cached_info:
+            return {'address': token_address, **cached_info}
         
-        return balances
+        try:
+            token_contract = self._aerc20(_cs(token_address))
+            
+            name, symbol, decimals = await asyncio.gather(
+                token_contract.functions.name().call(),
+                token_contract.functions.symbol().call(),
+                token_contract.functions.decimals().call()
+            )
+            
+            info = {
+                'address': token_address,
+                'name': name,
+                'symbol': symbol,
+                'decimals': decimals
+            }
+            self._cache_token_info(token_address, info)
+            
+            return info
+        except Exception as e:
+            print(f"Error getting token info for {token_address}: {e}")
+            return None
     
-    def get_wallet_all_tokens(self, wallet_address: str) -> Dict[str, Dict]:
+    async def aget_token_balance(self, token_address: str, wallet_address: str) -> Tuple[Decimal, int]:
         """
-        Get all tokens in wallet using Alchemy API (primary) with fallbacks
-        
-        Priority:
-        1. Alchemy Enhanced API (fast, complete)
-        2. BlockVision API (legacy, trial ended)
-        3. Native balance only (fallback)
+        Async version of get_token_balance
         
         Args:
-            wallet_address: Wallet address to check
+            token_address: Token contract address
+            wallet_address: Wallet address
             
         Returns:
-            Dict with token info and balances
+            Tuple of (balance as Decimal, decimals)
+        """
+        try:
+            checksum_token = _cs(token_address)
+            token_contract = self._aerc20(checksum_token)
+            checksum_wallet = _cs(wallet_address)
+            
+            decimals = self._known_decimals(checksum_token)
+            if decimals is not None:
+                balance_raw = await token_contract.functions.balanceOf(checksum_wallet).call()
+            else:
+                balance_raw, decimals = await asyncio.gather(
+                    token_contract.functions.balanceOf(checksum_wallet).call(),
+                    token_contract.functions.decimals().call()
+                )
+                self._cache_decimals(checksum_token, decimals)
+            
+            balance = Decimal(balance_raw) / _POW10_DEC[decimals]
+            return balance, decimals
+        except Exception as e:
+            print(f"Error getting token balance: {e}")
+            return Decimal('0'), 18
+    
+    async def _run_node_script(self, script_args: List[str], timeout: float) -> Dict:
         """
-        import subprocess
-        import json
-        import os
+        Run a Node.js helper script without blocking and parse its JSON output
         
-        # Try Alchemy first (PRIMARY)
+        Args:
+            script_args: Script path followed by its arguments
+            timeout: Timeout in seconds
+            
+        Returns:
+            Parsed JSON output
+        """
+        proc = await asyncio.create_subprocess_exec(
+            'node', *script_args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
         try:
-            print("🔍 Trying Alchemy Enhanced API...")
-            script_path = os.path.join(os.path.dirname(__file__), 'getTokensAlchemy.js')
+            stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            proc.kill()
+            raise
+        
+        if proc.returncode != 0:
+            raise ValueError(f"{os.path.basename(script_args[0])} returned non-zero exit code")
+        
+        return json.loads(stdout.decode().strip())
+    
+    async def _stream_node_script(self, script_args: List[str]) -> AsyncIterator[Dict]:
+        """
+        Run a Node.js helper script that prints NDJSON and yield each row as it arrives
+        
+        Args:
+            script_args: Script path followed by its arguments
             
-            result = subprocess.run(
-                ['node', script_path, wallet_address],
-                capture_output=True,
-                text=True,
-                timeout=15
-            )
+        Yields:
+            One parsed JSON object per output line
+        """
+        proc = await asyncio.create_subprocess_exec(
+            'node', *script_args,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL
+        )
+        try:
+            async for line in proc.stdout:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
             
-            if result.returncode == 0:
-                data = json.loads(result.stdout.strip())
+            if await proc.wait() != 0:
+                raise ValueError(f"{os.path.basename(script_args[0])} returned non-zero exit code")
+        finally:
+            if proc.returncode is None:
+                proc.kill()
+    
+    def _alchemy_row_to_balance(self, token: Dict) -> Optional[Dict]:
+        """Convert one getTokensAlchemy.js token row to a balances entry (None if empty)"""
+        balance_str = token.get('balance', '0')
+        if balance_str in _ZERO_BALANCE_STRINGS:
+            return None
+        
+        # Parse once, compare and store the same Decimal
+        balance = Decimal(balance_str)
+        if balance <= 0:
+            return None
+        
+        symbol = token.get('symbol', 'UNKNOWN')
+        token_address = token.get('address', '')
+        
+        return {
+            'symbol': symbol,
+            'name': token.get('name', symbol),
+            'balance': balance,
+            'decimals': token.get('decimals', 18),
+            'address': token_address,
+            # Check if token is in verified list
+            'verified': self._is_token_verified(token_address, symbol)
+        }
+    
+    async def _try_alchemy(self, wallet_address: str) -> Optional[Dict[str, Dict]]:
+        """Get wallet tokens from Alchemy Enhanced API (None if unavailable)"""
+        async def collect() -> Optional[Dict[str, Dict]]:
+            balances = {}
+            done = None
+            # Rows are converted as the script prints them, the full output is never buffered
+            async for row in self._stream_node_script([script_path, wallet_address, '--ndjson']):
+                row_type = row.get('type')
                 
-                if data.get('ok'):
-                    print(f"✅ Alchemy: Found {data.get('token_count', 0)} tokens")
-                    balances = {}
-                    
+                if row_type == 'native':
                     # Add native balance
-                    native_balance_str = data.get('native_balance', '0')
-                    if native_balance_str and float(native_balance_str) > 0:
+                    native_balance_str = row.get('native_balance', '0')
+                    if native_balance_str and native_balance_str not in _ZERO_BALANCE_STRINGS:
+                        native_balance = Decimal(native_balance_str)
+                    else:
+                        native_balance = Decimal(0)
+                    if native_balance > 0:
                         balances['MON'] = {
                             'symbol': 'MON',
                             'name': 'Monad',
-                            'balance': Decimal(native_balance_str),
+                            'balance': native_balance,
                             'decimals': 18,
                             'address': '0x0000000000000000000000000000000000000000',
                             'verified': True
                         }
-                    
-                    # Add all tokens
-                    for token in data.get('tokens', []):
-                        symbol = token.get('symbol', 'UNKNOWN')
-                        balance_str = token.get('balance', '0')
-                        token_address = token.get('address', '')
-                        
-                        if float(balance_str) > 0:
-                            # Check if token is in verified list
-                            is_verified = self._is_token_verified(token_address, symbol)
-                            
-                            balances[symbol] = {
-                                'symbol': symbol,
-                                'name': token.get('name', symbol),
-                                'balance': Decimal(balance_str),
-                                'decimals': token.get('decimals', 18),
-                                'address': token_address,
-                                'verified': is_verified
-                            }
-                    
-                    return balances
-                    
-        except Exception as e:
-            print(f"⚠️ Alchemy API failed: {e}")
+                elif row_type == 'token':
+                    entry = self._alchemy_row_to_balance(row)
+                    if entry:
+                        balances[entry['symbol']] = entry
+                elif row_type == 'done':
+                    done = row
+            
+            # Script must end with an ok done row, otherwise the output is partial
+            if not done or not done.get('ok'):
+                return None
+            
+            print(f"✅ Alchemy: Found {done.get('token_count', 0)} tokens")
+            return balances
         
-        # Fallback to BlockVision (SECONDARY - likely to fail due to trial ended)
         try:
-            print("🔄 Falling back to BlockVision API...")
-            script_path = os.path.join(os.path.dirname(__file__), 'getTokensBlockVision.js')
+            print("🔍 Trying Alchemy Enhanced API...")
+            script_path = os.path.join(os.path.dirname(__file__), 'getTokensAlchemy.js')
             
+            return await asyncio.wait_for(collect(), timeout=15)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Alchemy API failed: {type(e).__name__}: {e}")
+            return None
+    
+    async def _try_blockvision(self, wallet_address: str) -> Optional[Dict[str, Dict]]:
+        """Get wallet tokens from BlockVision API (legacy, likely to fail - trial ended)"""
+        try:
             # Get API key from config
             api_key = BLOCKVISION_API_KEY
             if not api_key:
                 raise ValueError("BLOCKVISION_API_KEY not configured")
             
-            result = subprocess.run(
-                ['node', script_path, wallet_address, api_key],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            
-            if result.returncode != 0:
-                raise ValueError("BlockVision returned non-zero exit code")
+            print("🔄 Trying BlockVision API...")
+            script_path = os.path.join(os.path.dirname(__file__), 'getTokensBlockVision.js')
             
-            data = json.loads(result.stdout.strip())
+            data = await self._run_node_script([script_path, wallet_address, api_key], timeout=10)
             
             if data.get('code') != 0:
                 raise ValueError(f"BlockVision error code: {data.get('code')}")
@@ -310,35 +867,40 @@ class BlockchainManager:
             
             for token in tokens_data:
                 symbol = token.get('symbol', 'UNKNOWN')
-                balance = token.get('balance', '0')
+                balance_str = token.get('balance', '0')
                 address = token.get('contractAddress', '')
                 name = token.get('name', symbol)
                 
-                # Skip tokens with 0 balance
+                # Skip tokens with 0 balance (cheap string test before parsing)
+                if balance_str in _ZERO_BALANCE_STRINGS:
+                    continue
                 try:
-                    if float(balance) == 0:
-                        continue
-                except:
+                    balance = Decimal(balance_str)
+                except (InvalidOperation, TypeError, ValueError):
+                    continue
+                if balance == 0:
                     continue
                 
                 balances[symbol] = {
                     'symbol': symbol,
                     'name': name,
-                    'balance': Decimal(balance),
+                    'balance': balance,
                     'address': address,
                     'verified': token.get('verified', False),
                     'imageURL': token.get('imageURL', '')
                 }
             
             return balances
-            
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
-            print(f"⚠️ BlockVision also failed: {e}")
-        
-        # Final fallback: Native balance only (TERTIARY)
-        print("ℹ️  Using native balance fallback (all APIs unavailable)")
+            print(f"⚠️ BlockVision failed: {type(e).__name__}: {e}")
+            return None
+    
+    async def _try_native(self, wallet_address: str) -> Dict[str, Dict]:
+        """Native balance only (always succeeds, used when all APIs are unavailable)"""
         balances = {}
-        native_balance = self.get_native_balance(wallet_address)
+        native_balance = await asyncio.to_thread(self.get_native_balance, wallet_address)
         if native_balance:
             balances['MON'] = {
                 'symbol': 'MON',
@@ -350,6 +912,137 @@ class BlockchainManager:
             }
         return balances
     
+    async def _add_verified_token_rows(self, wallet_address: str, balances: Dict[str, Dict]) -> Dict[str, Dict]:
+        """
+        Complete the native fallback with on-chain VERIFIED_TOKENS balances (one multicall)
+        Only run once every API source has failed - the multicall can't be cancelled mid-flight
+        """
+        for row in await asyncio.to_thread(self._verified_token_rows, wallet_address):
+            balances.setdefault(row['symbol'], {**row, 'verified': True})
+        return balances
+    
+    def _verified_token_rows(self, wallet_address: str) -> List[Dict]:
+        """Non-zero balances of all VERIFIED_TOKENS (one multicall, empty list on error)"""
+        try:
+            rows = self._fetch_token_rows(wallet_address, list(VERIFIED_TOKENS_CHECKSUM))
+        except Exception as e:
+            logger.warning("Verified token balances failed: %s", e)
+            return []
+        return [row for row in rows if row['balance'] > 0]
+    
+    async def _get_wallet_all_tokens_async(self, wallet_address: str) -> Dict[str, Dict]:
+        """
+        Query all token sources at once and return the best available result
+        
+        Sources run concurrently, so the worst case is the slowest source instead of
+        the sum of all timeouts. Priority is kept: a lower source is only used once
+        every source above it has failed.
+        """
+        tasks = [
+            asyncio.create_task(self._try_alchemy(wallet_address)),
+            asyncio.create_task(self._try_blockvision(wallet_address)),
+            asyncio.create_task(self._try_native(wallet_address))
+        ]
+        pending = set(tasks)
+        
+        try:
+            while pending:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                
+                # Walk sources in priority order: first success wins, stop at the first still running
+                for task in tasks:
+                    if not task.done():
+                        break
+                    if task.exception() is None and task.result() is not None:
+                        if task is tasks[-1]:
+                            print("ℹ️  Using native balance fallback (all APIs unavailable)")
+                            return await self._add_verified_token_rows(wallet_address, task.result())
+                        return task.result()
+            return {}
+        finally:
+            for task in pending:
+                task.cancel()
+    
+    def get_wallet_all_tokens(self, wallet_address: str) -> Dict[str, Dict]:
+        """
+        Get all tokens in wallet using Alchemy API (primary) with fallbacks
+        
+        Priority:
+        1. Alchemy Enhanced API (fast, complete)
+        2. BlockVision API (legacy, trial ended)
+        3. Native balance + verified token balances on-chain (fallback, only after the APIs failed)
+        
+        All sources are queried concurrently, the highest priority success is returned.
+        
+        Args:
+            wallet_address: Wallet address to check
+            
+        Returns:
+            Dict with token info and balances
+        """
+        try:
+            return self._run_async(self._get_wallet_all_tokens_async(wallet_address))
+        except Exception as e:
+            print(f"⚠️ Error getting wallet tokens: {type(e).__name__}: {e}")
+            return {}
+    
+    async def aget_wallet_all_tokens(self, wallet_address: str) -> Dict[str, Dict]:
+        """
+        Async version of get_wallet_all_tokens (awaits the background loop instead of blocking)
+        
+        Args:
+            wallet_address: Wallet address to check
+            
+        Returns:
+            Dict of tokens by symbol
+        """
+        future = asyncio.run_coroutine_threadsafe(self._get_wallet_all_tokens_async(wallet_address), self._loop)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout=30)
+        except Exception as e:
+            print(f"⚠️ Error getting wallet tokens: {type(e).__name__}: {e}")
+            return {}
+    
+    def get_wallet_fingerprint(self, wallet_address: str, token_addresses: List[str]) -> Optional[Tuple[str, ...]]:
+        """
+        Cheap snapshot of a wallet's on-chain state: native balance, nonce and the balances
+        of the given tokens, read with one JSON-RPC batch (token balances via Multicall3)
+        
+        Equal fingerprints mean none of these changed, so a full token scan can be skipped.
+        
+        Args:
+            wallet_address: Wallet address
+            token_addresses: Tokens whose balances are included
+            
+        Returns:
+            Tuple of raw RPC results, or None if any request failed
+        """
+        try:
+            checksum_wallet = _cs(wallet_address)
+            balance_data = '0x' + (_BALANCE_OF_SELECTOR + abi_encode(['address'], [checksum_wallet])).hex()
+            calls = [
+                (checksum_token, True, balance_data)
+                for checksum_token in dict.fromkeys(_cs(addr) for addr in token_addresses)
+            ]
+            
+            requests_ = [
+                ("eth_getBalance", [checksum_wallet, "latest"]),
+                ("eth_getTransactionCount", [checksum_wallet, "latest"])
+            ]
+            for start in range(0, len(calls), MULTICALL_BATCH_SIZE):
+                call_data = self.multicall_contract.encodeABI(
+                    fn_name='aggregate3', args=[calls[start:start + MULTICALL_BATCH_SIZE]]
+                )
+                requests_.append(("eth_call", [{"to": self.multicall_contract.address, "data": call_data}, "latest"]))
+            
+            items = self._batch_rpc(requests_)
+            if not all('result' in item for item in items):
+                return None
+            return tuple(item['result'] for item in items)
+        except Exception as e:
+            print(f"⚠️ Wallet fingerprint failed: {e}")
+            return None
+    
     def get_tokens_from_history(self, wallet_address: str, token_addresses: List[str]) -> Dict[str, Dict]:
         """
         Get token balances from user's history by checking blockchain directly
@@ -375,184 +1068,353 @@ class BlockchainManager:
                 'verified': True
             }
         
-        # Check each token from history
-        for token_address in token_addresses:
+        # Check all tokens from history in one batched read
+        for row in self._fetch_token_rows(wallet_address, token_addresses):
+            # Only include tokens with balance > 0
+            if row['balance'] > 0:
+                symbol = row['symbol']
+                balances[symbol] = {
+                    'symbol': symbol,
+                    'name': row['name'],
+                    'balance': row['balance'],
+                    'address': row['address'],
+                    'verified': True,  # Assume tokens from history are verified
+                    'decimals': row['decimals']
+                }
+        
+        return balances
+    
+    def _run_async(self, coro, timeout: float = 30):
+        """
+        Run a coroutine on the manager's background event loop and wait for it
+        (callers may already be inside the bot's event loop, so asyncio.run can't be used)
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result(timeout=timeout)
+    
+    async def _get_http_session(self) -> aiohttp.ClientSession:
+        """Shared aiohttp session, created lazily on the background loop and reused"""
+        if self._http_session is None or self._http_session.closed:
+            self._http_session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                headers={'Accept': 'application/json'}
+            )
+        return self._http_session
+    
+    async def _fetch_gecko_price(self, session: aiohttp.ClientSession, token_address: str) -> Optional[Decimal]:
+        """
+        Get token price from GeckoTerminal
+        
+        Args:
+            session: Shared aiohttp session
+            token_address: Token contract address
+            
+        Returns:
+            Price in USD (or WMON if no USD price) or None if not listed
+        """
+        token = token_address.lower()
+        
+        for url in GECKOTERMINAL_TOKEN_URLS:
             try:
-                info = self.get_token_info(token_address)
-                if not info:
-                    continue
+                async with session.get(url.format(token)) as response:
+                    if response.status != 200:
+                        continue
+                    data = await response.json()
                 
-                balance, _ = self.get_token_balance(token_address, wallet_address)
+                attributes = (data.get('data') or {}).get('attributes') or {}
                 
-                # Only include tokens with balance > 0
-                if balance > 0:
-                    symbol = info['symbol']
-                    balances[symbol] = {
-                        'symbol': symbol,
-                        'name': info['name'],
-                        'balance': balance,
-                        'address': token_address,
-                        'verified': True,  # Assume tokens from history are verified
-                        'decimals': info['decimals']
-                    }
+                # Priority: price_usd > price_native
+                price = attributes.get('price_usd') or attributes.get('price_native')
+                if price:
+                    return Decimal(str(price))
             except Exception as e:
-                print(f"⚠️ Error checking token {token_address}: {e}")
-                continue
+                print(f"⚠️ GeckoTerminal request failed for {token[:10]}: {type(e).__name__}: {e}")
         
-        return balances
+        return None
     
-    def get_token_price_from_nodejs(self, token_address: str) -> Optional[Decimal]:
+    def _get_cached_price(self, kind: str, token_address: str) -> Optional[Decimal]:
+        """Get a price fetched less than PRICE_CACHE_TTL seconds ago or None"""
+        entry = self._price_cache.get((kind, token_address.lower()))
+        if entry is not None and time.monotonic() - entry[1] < PRICE_CACHE_TTL:
+            return entry[0]
+        return None
+    
+    def _cache_price(self, kind: str, token_address: str, price: Optional[Decimal]):
+        """Remember a price (misses are not cached so they are retried next time)"""
+        if price:
+            self._price_cache[(kind, token_address.lower())] = (price, time.monotonic())
+    
+    async def _fetch_many_prices(self, token_addresses: List[str]) -> Dict[str, Optional[Decimal]]:
+        """Fetch GeckoTerminal prices for many tokens concurrently"""
+        session = await self._get_http_session()
+        prices = await asyncio.gather(
+            *(self._fetch_gecko_price(session, token_address) for token_address in token_addresses)
+        )
+        return dict(zip(token_addresses, prices))
+    
+    def get_token_prices(self, token_addresses: List[str], force_refresh: bool = False) -> Dict[str, Optional[Decimal]]:
         """
-        Get token price using Node.js script (GeckoTerminal API + on-chain fallback)
+        Get prices for many tokens at once (GeckoTerminal API + on-chain fallback)
         
         Args:
-            token_address: Token contract address
+            token_addresses: List of token contract addresses
+            force_refresh: Ignore cached prices
             
         Returns:
-            Price in USD or WMON or None if not available
+            Dict of token address -> price in USD or WMON (None if not available)
         """
+        prices = {}
+        if not force_refresh:
+            for token_address in token_addresses:
+                cached_price = self._get_cached_price('api', token_address)
+                if cached_price is not None:
+                    prices[token_address] = cached_price
+        
+        to_fetch = [token_address for token_address in token_addresses if token_address not in prices]
+        if not to_fetch:
+            return prices
+        
         try:
-            import subprocess
-            import json
-            import os
-            
-            # Path to price.js script
-            script_path = os.path.join(os.path.dirname(__file__), 'price.js')
+            fetched = self._run_async(self._fetch_many_prices(to_fetch))
+        except Exception as e:
+            print(f"⚠️ GeckoTerminal price fetch failed: {type(e).__name__}: {e}")
+            fetched = {token_address: None for token_address in to_fetch}
+        
+        # Fallback: DEX router quotes (one multicall) for tokens GeckoTerminal doesn't list
+        misses = [token_address for token_address, price in fetched.items() if not price]
+        if misses:
+            fetched.update(self.get_token_prices_onchain(misses, force_refresh=force_refresh))
+        
+        for token_address, price in fetched.items():
+            self._cache_price('api', token_address, price)
+            prices[token_address] = price
+        
+        return prices
+    
+    def get_token_price_from_nodejs(self, token_address: str, force_refresh: bool = False) -> Optional[Decimal]:
+        """
+        Get token price (GeckoTerminal API + on-chain fallback)
+        Kept for compatibility - prices are now fetched in-process, see get_token_prices()
+        
+        Args:
+            token_address: Token contract address
+            force_refresh: Ignore cached price
             
-            print(f"🔍 Fetching price via Node.js script for {token_address[:10]}...")
+        Returns:
+            Price in USD or WMON or None if not available
+        """
+        return self.get_token_prices([token_address], force_refresh=force_refresh).get(token_address)
+    
+    def _price_via_router(self, token_address: str, amount_in_wei: Optional[int] = None,
+                          decimals: Optional[int] = None) -> Decimal:
+        """
+        Quote token -> WMON on the DEX router
+        
+        Args:
+            token_address: Token contract address
+            amount_in_wei: Amount to quote in smallest unit (default: 1 whole token)
+            decimals: Token decimals if already known (skips the decimals lookup)
             
-            # Set environment variables for the Node.js script
-            env = os.environ.copy()
-            env['RPC_URL'] = MONAD_TESTNET_RPC_URL
-            env['ROUTER'] = DEX_ROUTER_ADDRESS
-            env['WMON'] = WETH_ADDRESS
+        Returns:
+            Output amount in native currency (raises on router error / no liquidity)
+        """
+        if amount_in_wei is None:
+            if decimals is None:
+                decimals = self._get_decimals(_cs(token_address))
+            amount_in_wei = _POW10_INT[decimals]
+        
+        path = [_cs(token_address), _cs(WETH_ADDRESS)]
+        amounts = self.router_contract.functions.getAmountsOut(amount_in_wei, path).call()
+        
+        return Decimal(self.w3.from_wei(amounts[-1], 'ether'))
+    
+    def get_token_prices_onchain(self, token_addresses: List[str],
+                                 force_refresh: bool = False) -> Dict[str, Optional[Decimal]]:
+        """
+        Get on-chain DEX prices for many tokens with one multicall of getAmountsOut
+        
+        Args:
+            token_addresses: List of token contract addresses
+            force_refresh: Ignore cached prices
             
-            # Call Node.js script
-            result = subprocess.run(
-                ['node', script_path, token_address],
-                capture_output=True,
-                text=True,
-                timeout=10,
-                env=env
+        Returns:
+            Dict of token address -> price in USD (estimated) or None if unavailable
+        """
+        prices = {}
+        if not force_refresh:
+            for token_address in token_addresses:
+                cached_price = self._get_cached_price('onchain', token_address)
+                if cached_price is not None:
+                    prices[token_address] = cached_price
+        
+        to_fetch = [token_address for token_address in token_addresses if token_address not in prices]
+        if len(to_fetch) == 1:
+            prices[to_fetch[0]] = self.get_token_price_onchain(to_fetch[0], force_refresh=True)
+            return prices
+        
+        # Query: 1 token = how many WMON? (unknown decimals -> no quote)
+        quoted = []
+        calls = []
+        router_address = self.router_contract.address
+        checksum_weth = _cs(WETH_ADDRESS)
+        for token_address in to_fetch:
+            prices[token_address] = None
+            try:
+                decimals = self._get_decimals(_cs(token_address))
+            except Exception:
+                continue
+            call_data = self.router_contract.encodeABI(
+                fn_name='getAmountsOut',
+                args=[_POW10_INT[decimals], [_cs(token_address), checksum_weth]]
             )
-            
-            if result.returncode != 0:
-                print(f"⚠️ Node.js script error: {result.stderr}")
-                return None
-            
-            # Parse JSON output
-            output = result.stdout.strip()
-            data = json.loads(output)
-            
-            if not data.get('ok'):
-                reason = data.get('reason', 'unknown')
-                print(f"⚠️ Price not available: {reason}")
-                return None
-            
-            # Priority: price_usd > price_native
-            method = data.get('method', 'unknown')
-            
-            if data.get('price_usd'):
-                price = Decimal(str(data['price_usd']))
-                print(f"✅ Price from {method}: ${price} USD")
-                return price
-            elif data.get('priceNative'):
-                price = Decimal(str(data['priceNative']))
-                print(f"✅ Price from {method}: {price} WMON")
-                return price
-            
-            print(f"⚠️ No price in response")
-            return None
-            
-        except subprocess.TimeoutExpired:
-            print(f"⏱️ Node.js script timeout")
-            return None
-        except json.JSONDecodeError as e:
-            print(f"⚠️ Failed to parse Node.js output: {e}")
-            return None
+            quoted.append(token_address)
+            calls.append((router_address, call_data))
+        
+        if not calls:
+            return prices
+        
+        try:
+            results = self._multicall(calls)
         except Exception as e:
-            print(f"⚠️ Error calling Node.js script: {type(e).__name__}: {e}")
-            return None
+            print(f"⚠️ Multicall price query failed, quoting one by one: {e}")
+            for token_address in quoted:
+                prices[token_address] = self.get_token_price_onchain(token_address, force_refresh=True)
+            return prices
+        
+        # For testnet, estimate MONAD = $1 USD
+        monad_usd_price = Decimal('1.0')
+        for token_address, (success, return_data) in zip(quoted, results):
+            if not success:
+                continue
+            price_wei = abi_decode(['uint256[]'], return_data)[0][-1]
+            price_usd = Decimal(self.w3.from_wei(price_wei, 'ether')) * monad_usd_price
+            self._cache_price('onchain', token_address, price_usd)
+            prices[token_address] = price_usd
+        
+        return prices
     
-    def get_token_price_onchain(self, token_address: str) -> Optional[Decimal]:
+    def get_token_price_onchain(self, token_address: str, force_refresh: bool = False) -> Optional[Decimal]:
         """
         Get token price directly from DEX on-chain (no external APIs)
         More accurate but slower. Used as fallback when API prices are suspicious.
         
         Args:
             token_address: Token contract address
+            force_refresh: Ignore cached price
             
         Returns:
             Price in USD (estimated) or None if unavailable
         """
+        if not force_refresh:
+            cached_price = self._get_cached_price('onchain', token_address)
+            if cached_price is not None:
+                return cached_price
+        
         try:
-            checksum_token = Web3.to_checksum_address(token_address)
-            checksum_weth = Web3.to_checksum_address(WETH_ADDRESS)
-            
-            info = self.get_token_info(token_address)
-            if not info:
-                return None
-            
             # Query: 1 token = how many WMON?
-            amount_in_wei = int(1 * (10 ** info['decimals']))
-            
-            path = [checksum_token, checksum_weth]
-            amounts = self.router_contract.functions.getAmountsOut(amount_in_wei, path).call()
-            
-            price_wei = amounts[-1]
-            price_in_monad = Decimal(self.w3.from_wei(price_wei, 'ether'))
+            price_in_monad = self._price_via_router(token_address)
             
             # For testnet, estimate MONAD = $1 USD
             # In production, you'd fetch real MONAD price
             monad_usd_price = Decimal('1.0')
             price_usd = price_in_monad * monad_usd_price
             
+            self._cache_price('onchain', token_address, price_usd)
             return price_usd
         except Exception as e:
             # No liquidity or router error
             print(f"⚠️ On-chain price query failed: {e}")
             return None
     
-    def get_token_price_in_native(self, token_address: str, amount_in: Decimal = Decimal('1')) -> Optional[Decimal]:
+    def get_token_price_in_native(self, token_address: str, amount_in: Decimal = Decimal('1'),
+                                  force_refresh: bool = False) -> Optional[Decimal]:
         """
         Get token price - tries multiple sources
         
         Args:
             token_address: Token contract address
             amount_in: Amount of tokens to check price for
+            force_refresh: Ignore cached prices
             
         Returns:
             Price in native currency or None (if no liquidity or router error)
         """
-        # Method 1: Try Node.js script (GeckoTerminal + on-chain)
-        nodejs_price = self.get_token_price_from_nodejs(token_address)
-        if nodejs_price and nodejs_price > 0:
-            return nodejs_price
+        # Method 1: Try GeckoTerminal (+ on-chain fallback)
+        api_price = self.get_token_price_from_nodejs(token_address, force_refresh=force_refresh)
+        if api_price and api_price > 0:
+            return api_price
         
         # Method 2: Try DEX router (may not work if no liquidity)
         try:
-            checksum_token = Web3.to_checksum_address(token_address)
-            checksum_weth = Web3.to_checksum_address(WETH_ADDRESS)
-            
-            info = self.get_token_info(token_address)
-            if not info:
-                return None
-            
-            amount_in_wei = int(amount_in * (10 ** info['decimals']))
+            decimals = self._get_decimals(_cs(token_address))
+            amount_in_wei = int(amount_in * _POW10_INT[decimals])
             
-            path = [checksum_token, checksum_weth]
-            amounts = self.router_contract.functions.getAmountsOut(amount_in_wei, path).call()
-            
-            price_wei = amounts[-1]
-            price_native = Decimal(self.w3.from_wei(price_wei, 'ether'))
-            
-            return price_native
+            return self._price_via_router(token_address, amount_in_wei=amount_in_wei)
         except Exception as e:
             # Price not available from both sources
             return None
     
+    def _get_nonce(self, address: str) -> int:
+        """
+        Reserve the next nonce for a sender
+        
+        Args:
+            address: Sender checksum address
+            
+        Returns:
+            Nonce to use for the next transaction
+        """
+        with self._nonce_lock:
+            if address not in self._nonce_cache:
+                self._nonce_cache[address] = self.w3.eth.get_transaction_count(address, 'pending')
+            nonce = self._nonce_cache[address]
+            self._nonce_cache[address] = nonce + 1
+            return nonce
+    
+    def _prime_nonce(self, address: str, nonce: int):
+        """Seed the local nonce for a sender from an already fetched pending count"""
+        with self._nonce_lock:
+            self._nonce_cache.setdefault(address, nonce)
+    
+    def sync_nonce(self, address: str):
+        """
+        Forget the local nonce for a sender so the next TX re-reads it from the node
+        
+        Called at the start of every user-initiated buy/sell/send (the wallet may have sent
+        from elsewhere, or a broadcast TX may have been dropped) and after a failed send.
+        """
+        with self._nonce_lock:
+            self._nonce_cache.pop(address, None)
+    
+    @staticmethod
+    def _signer(private_key: Union[str, LocalAccount]) -> LocalAccount:
+        """Parse a private key into an account, or pass through an already parsed one"""
+        if isinstance(private_key, LocalAccount):
+            return private_key
+        return Account.from_key(private_key)
+    
+    def sign_and_send(self, transaction: Dict, private_key: Union[str, LocalAccount]):
+        """
+        Assign the next local nonce, sign and send a built transaction
+        
+        Args:
+            transaction: Transaction dict without nonce (must contain 'from')
+            private_key: Private key or account (parsed once per operation) for signing
+            
+        Returns:
+            Transaction hash (HexBytes)
+        """
+        sender = transaction['from']
+        transaction['nonce'] = self._get_nonce(sender)
+        try:
+            signed_txn = self._signer(private_key).sign_transaction(transaction)
+            return self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        except Exception:
+            # Nonce may not have been used, resync before the next TX
+            self.sync_nonce(sender)
+            raise
+    
     def approve_token(self, token_address: str, spender_address: str, amount: int, 
-                     private_key: str, gas_mode: str = 'normal') -> Optional[str]:
+                     private_key: Union[str, LocalAccount], gas_mode: str = 'normal') -> Optional[str]:
         """
         Approve token spending
         
@@ -560,18 +1422,18 @@ class BlockchainManager:
             token_address: Token contract address
             spender_address: Spender address (usually router)
             amount: Amount to approve (in wei)
-            private_key: Private key for signing
+            private_key: Private key or account for signing
             gas_mode: Gas price mode
             
         Returns:
             Transaction hash or None
         """
         try:
-            checksum_token = Web3.to_checksum_address(token_address)
-            checksum_spender = Web3.to_checksum_address(spender_address)
+            checksum_token = _cs(token_address)
+            checksum_spender = _cs(spender_address)
             
-            account = Account.from_key(private_key)
-            token_contract = self.w3.eth.contract(address=checksum_token, abi=ERC20_ABI)
+            account = self._signer(private_key)
+            token_contract = self._erc20(checksum_token)
             
             current_allowance = token_contract.functions.allowance(
                 account.address, checksum_spender
@@ -580,22 +1442,18 @@ class BlockchainManager:
             if current_allowance >= amount:
                 return "ALREADY_APPROVED"
             
-            nonce = self.w3.eth.get_transaction_count(account.address)
-            
-            gas_params = GAS_PRICE_MODES.get(gas_mode, GAS_PRICE_MODES['normal'])
+            gas_params = self._gas_params_wei.get(gas_mode, self._gas_params_wei['normal'])
             
             transaction = token_contract.functions.approve(
                 checksum_spender, amount
             ).build_transaction({
                 'from': account.address,
-                'nonce': nonce,
-                'maxFeePerGas': self.w3.to_wei(gas_params['maxFeePerGas'], 'gwei'),
-                'maxPriorityFeePerGas': self.w3.to_wei(gas_params['maxPriorityFeePerGas'], 'gwei'),
+                'maxFeePerGas': gas_params['maxFeePerGas'],
+                'maxPriorityFeePerGas': gas_params['maxPriorityFeePerGas'],
                 'chainId': CHAIN_ID
             })
             
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            tx_hash = self.sign_and_send(transaction, account)
             
             return tx_hash.hex()
         except Exception as e:
@@ -618,14 +1476,13 @@ class BlockchainManager:
         Returns:
             Dict with transaction info or None
         """
-        private_key_to_delete = private_key
-        
         try:
-            checksum_token = Web3.to_checksum_address(token_address)
-            checksum_weth = Web3.to_checksum_address(WETH_ADDRESS)
-            checksum_wallet = Web3.to_checksum_address(wallet_address)
+            checksum_token = _cs(token_address)
+            checksum_weth = _cs(WETH_ADDRESS)
+            checksum_wallet = _cs(wallet_address)
             
-            account = Account.from_key(private_key_to_delete)
+            account = Account.from_key(private_key)
+            self.sync_nonce(account.address)
             
             amount_in_wei = self.w3.to_wei(amount_monad, 'ether')
             
@@ -637,22 +1494,19 @@ class BlockchainManager:
             
             deadline = int(time.time()) + 300
             
-            nonce = self.w3.eth.get_transaction_count(account.address)
-            gas_params = GAS_PRICE_MODES.get(gas_mode, GAS_PRICE_MODES['normal'])
+            gas_params = self._gas_params_wei.get(gas_mode, self._gas_params_wei['normal'])
             
             transaction = self.router_contract.functions.swapExactETHForTokens(
                 min_output, path, checksum_wallet, deadline
             ).build_transaction({
                 'from': account.address,
                 'value': amount_in_wei,
-                'nonce': nonce,
-                'maxFeePerGas': self.w3.to_wei(gas_params['maxFeePerGas'], 'gwei'),
-                'maxPriorityFeePerGas': self.w3.to_wei(gas_params['maxPriorityFeePerGas'], 'gwei'),
+                'maxFeePerGas': gas_params['maxFeePerGas'],
+                'maxPriorityFeePerGas': gas_params['maxPriorityFeePerGas'],
                 'chainId': CHAIN_ID
             })
             
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key_to_delete)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            tx_hash = self.sign_and_send(transaction, account)
             
             result = {
                 'tx_hash': tx_hash.hex(),
@@ -666,12 +1520,10 @@ class BlockchainManager:
         except Exception as e:
             print(f"Error buying token: {e}")
             return None
-        finally:
-            private_key_to_delete = None
-            del private_key_to_delete
     
     def sell_token(self, token_address: str, amount_tokens: Decimal, wallet_address: str,
-                   private_key: str, slippage: float = 5.0, gas_mode: str = 'normal') -> Optional[Dict]:
+                   private_key: str, slippage: float = 5.0, gas_mode: str = 'normal',
+                   amount_tokens_wei: Optional[int] = None) -> Optional[Dict]:
         """
         Sell tokens for native currency
         
@@ -682,33 +1534,41 @@ class BlockchainManager:
             private_key: Private key for signing
             slippage: Slippage tolerance in percentage
             gas_mode: Gas price mode
+            amount_tokens_wei: Exact amount in smallest unit (skips decimals lookup and conversion)
             
         Returns:
             Dict with transaction info or None
         """
-        private_key_to_delete = private_key
-        
         try:
-            checksum_token = Web3.to_checksum_address(token_address)
-            checksum_weth = Web3.to_checksum_address(WETH_ADDRESS)
-            checksum_wallet = Web3.to_checksum_address(wallet_address)
-            checksum_router = Web3.to_checksum_address(DEX_ROUTER_ADDRESS)
+            checksum_token = _cs(token_address)
+            checksum_weth = _cs(WETH_ADDRESS)
+            checksum_wallet = _cs(wallet_address)
+            checksum_router = _cs(DEX_ROUTER_ADDRESS)
             
-            info = self.get_token_info(token_address)
-            if not info:
-                return None
+            # Parse the key once, the approval and the swap both sign with it
+            # (and share one pending-nonce read)
+            account = Account.from_key(private_key)
+            self.sync_nonce(account.address)
             
-            amount_in_wei = int(amount_tokens * (10 ** info['decimals']))
+            if amount_tokens_wei is not None:
+                amount_in_wei = amount_tokens_wei
+            else:
+                decimals = self._get_decimals(checksum_token)
+                amount_in_wei = int(amount_tokens * _POW10_INT[decimals])
             
             approve_hash = self.approve_token(
                 token_address, DEX_ROUTER_ADDRESS, amount_in_wei * 2, 
-                private_key_to_delete, gas_mode
+                account, gas_mode
             )
             
+            # Wait for the approval to be mined (sub-second on Monad) instead of a fixed sleep
             if approve_hash and approve_hash != "ALREADY_APPROVED":
-                time.sleep(3)
-            
-            account = Account.from_key(private_key_to_delete)
+                approve_receipt = self.w3.eth.wait_for_transaction_receipt(
+                    approve_hash, timeout=15, poll_latency=0.2
+                )
+                if approve_receipt['status'] != 1:
+                    print(f"Error selling token: approval transaction {approve_hash} failed")
+                    return None
             
             path = [checksum_token, checksum_weth]
             amounts_out = self.router_contract.functions.getAmountsOut(amount_in_wei, path).call()
@@ -719,21 +1579,18 @@ class BlockchainManager:
             # Deadline: 20 minutes (same as Monad official repo)
             deadline = int(time.time()) + (60 * 20)
             
-            nonce = self.w3.eth.get_transaction_count(account.address)
-            gas_params = GAS_PRICE_MODES.get(gas_mode, GAS_PRICE_MODES['normal'])
+            gas_params = self._gas_params_wei.get(gas_mode, self._gas_params_wei['normal'])
             
             transaction = self.router_contract.functions.swapExactTokensForETH(
                 amount_in_wei, min_output, path, checksum_wallet, deadline
             ).build_transaction({
                 'from': account.address,
-                'nonce': nonce,
-                'maxFeePerGas': self.w3.to_wei(gas_params['maxFeePerGas'], 'gwei'),
-                'maxPriorityFeePerGas': self.w3.to_wei(gas_params['maxPriorityFeePerGas'], 'gwei'),
+                'maxFeePerGas': gas_params['maxFeePerGas'],
+                'maxPriorityFeePerGas': gas_params['maxPriorityFeePerGas'],
                 'chainId': CHAIN_ID
             })
             
-            signed_txn = self.w3.eth.account.sign_transaction(transaction, private_key_to_delete)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            tx_hash = self.sign_and_send(transaction, account)
             
             result = {
                 'tx_hash': tx_hash.hex(),
@@ -748,9 +1605,6 @@ class BlockchainManager:
         except Exception as e:
             print(f"Error selling token: {e}")
             return None
-        finally:
-            private_key_to_delete = None
-            del private_key_to_delete
     
     def wait_for_transaction(self, tx_hash: str, timeout: int = 120) -> bool:
         """
@@ -770,8 +1624,93 @@ class BlockchainManager:
             print(f"Error waiting for transaction: {e}")
             return False
     
+    @staticmethod
+    def _transfer_gas_limit(estimated_gas: int) -> int:
+        """Get the transfer() gas limit from this send's eth_estimateGas result"""
+        # Estimates depend on token, recipient (new holders cost more) and amount, so they
+        # are never reused - headroom on top, never below the standard limit
+        return max(int(estimated_gas * GAS_ESTIMATE_MULTIPLIER), ERC20_TRANSFER_GAS)
+    
+    def _build_transfer_tx(self, checksum_token: str, checksum_wallet: str,
+                           checksum_recipient: str, amount_wei: int) -> Dict:
+        """
+        Build an ERC20 transfer() transaction dict directly (no ABI lookup, no RPC)
+        
+        Returns:
+            Transaction dict without gas and nonce
+        """
+        gas_settings = self._gas_params_wei['normal']
+        return {
+            'from': checksum_wallet,
+            'to': checksum_token,
+            'value': 0,
+            'data': _TRANSFER_SELECTOR + abi_encode(['address', 'uint256'], [checksum_recipient, amount_wei]),
+            'maxFeePerGas': gas_settings['maxFeePerGas'],
+            'maxPriorityFeePerGas': gas_settings['maxPriorityFeePerGas'],
+            'chainId': CHAIN_ID
+        }
+    
+    def _build_native_tx(self, checksum_wallet: str, checksum_recipient: str, value_wei: int) -> Dict:
+        """
+        Build a native MON transfer dict (same gas params and chain id as token transfers, no RPC)
+        
+        Returns:
+            Transaction dict without nonce
+        """
+        gas_settings = self._gas_params_wei['normal']
+        return {
+            'from': checksum_wallet,
+            'to': checksum_recipient,
+            'value': value_wei,
+            'gas': NATIVE_TRANSFER_GAS,
+            'maxFeePerGas': gas_settings['maxFeePerGas'],
+            'maxPriorityFeePerGas': gas_settings['maxPriorityFeePerGas'],
+            'chainId': CHAIN_ID
+        }
+    
+    def _prefetch_send_state(self, checksum_token: str, checksum_wallet: str) -> int:
+        """
+        Get token decimals and prime the sender nonce with at most one RPC round trip
+        
+        Args:
+            checksum_token: Token checksum address
+            checksum_wallet: Sender checksum address
+            
+        Returns:
+            Token decimals
+        """
+        decimals = self._known_decimals(checksum_token)
+        
+        with self._nonce_lock:
+            nonce_known = checksum_wallet in self._nonce_cache
+        
+        if decimals is not None and nonce_known:
+            return decimals
+        
+        # eth_call decimals() and eth_getTransactionCount(pending) in one JSON-RPC batch
+        batch = []
+        if decimals is None:
+            batch.append(("eth_call", [
+                {"to": checksum_token, "data": self._erc20_meta_call_data['decimals']}, "latest"
+            ]))
+        if not nonce_known:
+            batch.append(("eth_getTransactionCount", [checksum_wallet, "pending"]))
+        
+        items = self._batch_rpc(batch)
+        for (method, _), item in zip(batch, items):
+            if 'result' not in item:
+                raise ValueError(f"{method} failed: {item.get('error', 'no response')}")
+            if method == "eth_call":
+                decimals = abi_decode(['uint8'], Web3.to_bytes(hexstr=item['result']))[0]
+            else:
+                self._prime_nonce(checksum_wallet, int(item['result'], 16))
+        
+        self._cache_decimals(checksum_token, decimals)
+        return decimals
+    
     def send_token(self, token_address: str, recipient_address: str, amount: Decimal,
-                   wallet_address: str, private_key: str) -> Optional[Dict]:
+                   wallet_address: str, private_key: str,
+                   amount_wei: Optional[int] = None) -> Optional[Dict]:
         """
         Send ERC20 tokens to another address
         
@@ -781,66 +1720,174 @@ class BlockchainManager:
             amount: Amount of tokens to send
             wallet_address: Sender's wallet address
             private_key: Private key for signing
+            amount_wei: Exact amount in smallest unit (skips decimals lookup and conversion)
             
         Returns:
             Dict with transaction info or None
         """
-        private_key_to_delete = private_key
-        
         try:
-            checksum_token = Web3.to_checksum_address(token_address)
-            checksum_recipient = Web3.to_checksum_address(recipient_address)
-            checksum_wallet = Web3.to_checksum_address(wallet_address)
+            checksum_token = _cs(token_address)
+            checksum_recipient = _cs(recipient_address)
+            checksum_wallet = _cs(wallet_address)
+            self.sync_nonce(checksum_wallet)
+            
+            if amount_wei is not None:
+                amount_in_smallest_unit = amount_wei
+            else:
+                # Decimals (cached) and the sender nonce, in one round trip when unknown
+                scale = _POW10_INT[self._prefetch_send_state(checksum_token, checksum_wallet)]
+                
+                # Convert amount to smallest unit (int() truncates, never rounds up)
+                amount_in_smallest_unit = int(amount * scale)
             
-            # Get token contract
-            token_contract = self.w3.eth.contract(address=checksum_token, abi=ERC20_ABI)
+            # Build transaction
+            transfer_txn = self._build_transfer_tx(
+                checksum_token, checksum_wallet, checksum_recipient, amount_in_smallest_unit
+            )
             
-            # Get token decimals
-            decimals = token_contract.functions.decimals().call()
+            # Estimated for this recipient and amount (ERC20_TRANSFER_GAS is only the floor)
+            transfer_txn['gas'] = self._transfer_gas_limit(self.w3.eth.estimate_gas(transfer_txn))
             
-            # Convert amount to smallest unit
-            amount_in_smallest_unit = int(amount * Decimal(10 ** decimals))
+            # Sign and send
+            tx_hash = self.sign_and_send(transfer_txn, private_key)
             
-            # Build transfer transaction
-            nonce = self.w3.eth.get_transaction_count(checksum_wallet)
+            result = {
+                'tx_hash': tx_hash.hex(),
+                'amount': str(amount),
+                'recipient': recipient_address
+            }
             
-            # Get gas price
-            gas_settings = GAS_PRICE_MODES.get('normal', GAS_PRICE_MODES['normal'])
-            max_fee = self.w3.to_wei(gas_settings['maxFeePerGas'], 'gwei')
-            max_priority = self.w3.to_wei(gas_settings['maxPriorityFeePerGas'], 'gwei')
+            return result
+            
+        except Exception:
+            logger.exception("send_token failed")
+            return None
+    
+    async def _aget_nonce(self, address: str) -> int:
+        """Async version of _get_nonce (reads the pending count only when not cached)"""
+        with self._nonce_lock:
+            if address in self._nonce_cache:
+                nonce = self._nonce_cache[address]
+                self._nonce_cache[address] = nonce + 1
+                return nonce
+        
+        self._prime_nonce(address, await self.aw3.eth.get_transaction_count(address, 'pending'))
+        return self._get_nonce(address)
+    
+    async def asend_token(self, token_address: str, recipient_address: str, amount: Decimal,
+                          wallet_address: str, private_key: str,
+                          amount_wei: Optional[int] = None) -> Optional[Dict]:
+        """
+        Async version of send_token (AsyncWeb3, does not block the event loop)
+        
+        Args:
+            token_address: Token contract address
+            recipient_address: Recipient's wallet address
+            amount: Amount of tokens to send
+            wallet_address: Sender's wallet address
+            private_key: Private key for signing
+            amount_wei: Exact amount in smallest unit (skips decimals lookup and conversion)
+            
+        Returns:
+            Dict with transaction info or None
+        """
+        checksum_wallet = None
+        
+        try:
+            checksum_token = _cs(token_address)
+            checksum_recipient = _cs(recipient_address)
+            checksum_wallet = _cs(wallet_address)
+            self.sync_nonce(checksum_wallet)
+            
+            token_contract = self._aerc20(checksum_token)
+            
+            # Decimals (cached) and nonce, fetched concurrently when unknown
+            if amount_wei is None:
+                decimals = self._known_decimals(checksum_token)
+                if decimals is None:
+                    decimals, nonce = await asyncio.gather(
+                        token_contract.functions.decimals().call(),
+                        self._aget_nonce(checksum_wallet)
+                    )
+                    self._cache_decimals(checksum_token, decimals)
+                else:
+                    nonce = await self._aget_nonce(checksum_wallet)
+                scale = _POW10_INT[decimals]
+            else:
+                nonce = await self._aget_nonce(checksum_wallet)
+            
+            # Convert amount to smallest unit (int() truncates, never rounds up)
+            if amount_wei is not None:
+                amount_in_smallest_unit = amount_wei
+            else:
+                amount_in_smallest_unit = int(amount * scale)
             
             # Build transaction
-            transfer_txn = token_contract.functions.transfer(
-                checksum_recipient,
-                amount_in_smallest_unit
-            ).build_transaction({
-                'from': checksum_wallet,
-                'nonce': nonce,
-                'maxFeePerGas': max_fee,
-                'maxPriorityFeePerGas': max_priority,
-                'gas': 100000,
-                'chainId': CHAIN_ID
-            })
+            transfer_txn = self._build_transfer_tx(
+                checksum_token, checksum_wallet, checksum_recipient, amount_in_smallest_unit
+            )
             
-            # Sign and send
-            signed_txn = self.w3.eth.account.sign_transaction(transfer_txn, private_key_to_delete)
-            tx_hash = self.w3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            # Estimated for this recipient and amount (ERC20_TRANSFER_GAS is only the floor)
+            transfer_txn['gas'] = self._transfer_gas_limit(await self.aw3.eth.estimate_gas(transfer_txn))
+            transfer_txn['nonce'] = nonce
             
-            result = {
+            # Sign locally, send over the async provider
+            signed_txn = Account.sign_transaction(transfer_txn, private_key)
+            tx_hash = await self.aw3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            
+            return {
                 'tx_hash': tx_hash.hex(),
                 'amount': str(amount),
                 'recipient': recipient_address
             }
             
-            return result
+        except Exception:
+            logger.exception("asend_token failed")
+            if checksum_wallet:
+                # A nonce may have been reserved but not used, resync before the next TX
+                self.sync_nonce(checksum_wallet)
+            return None
+    
+    async def asend_native(self, recipient_address: str, amount: Decimal,
+                           wallet_address: str, private_key: str) -> Optional[Dict]:
+        """
+        Send native MON to another address (same nonce cache and submit path as asend_token)
+        
+        Args:
+            recipient_address: Recipient's wallet address
+            amount: Amount of MON to send
+            wallet_address: Sender's wallet address
+            private_key: Private key for signing
             
-        except Exception as e:
-            print(f"Error sending token: {e}")
-            import traceback
-            traceback.print_exc()
+        Returns:
+            Dict with transaction info or None
+        """
+        checksum_wallet = None
+        
+        try:
+            checksum_wallet = _cs(wallet_address)
+            self.sync_nonce(checksum_wallet)
+            
+            transfer_txn = self._build_native_tx(
+                checksum_wallet, _cs(recipient_address), Web3.to_wei(amount, 'ether')
+            )
+            transfer_txn['nonce'] = await self._aget_nonce(checksum_wallet)
+            
+            # Sign locally, send over the async provider
+            signed_txn = Account.sign_transaction(transfer_txn, private_key)
+            tx_hash = await self.aw3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            
+            return {
+                'tx_hash': tx_hash.hex(),
+                'amount': str(amount),
+                'recipient': recipient_address
+            }
+            
+        except Exception:
+            logger.exception("asend_native failed")
+            if checksum_wallet:
+                # A nonce may have been reserved but not used, resync before the next TX
+                self.sync_nonce(checksum_wallet)
             return None
-        finally:
-            private_key_to_delete = None
-            del private_key_to_delete
 
 blockchain_manager = BlockchainManager()
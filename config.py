@@ -3,25 +3,45 @@ Configuration Module - Constants, ABIs, and blockchain configuration
 """
 import os
 from dotenv import load_dotenv
+from web3 import Web3
 
 load_dotenv()
 
 # Bot Configuration
 TELEGRAM_BOT_TOKEN = os.getenv('TELEGRAM_BOT_TOKEN')
 
+# Logging (rotating file, level name from env)
+LOG_FILE = os.getenv('LOG_FILE', 'bot.log')
+LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
+
 # Blockchain Configuration
 MONAD_TESTNET_RPC_URL = os.getenv('MONAD_TESTNET_RPC_URL')
+# Optional WebSocket RPC, lets the notification monitor react to token transfers as they happen
+MONAD_TESTNET_WSS_URL = os.getenv('MONAD_TESTNET_WSS_URL', '')
 # UniswapV2Router02 on Monad testnet (Official from monad-developers repo)
 DEX_ROUTER_ADDRESS = os.getenv('DEX_ROUTER_ADDRESS', '0xfb8e1c3b833f9e67a71c859a132cf783b645e436')
 NATIVE_CURRENCY = 'MONAD'
 CHAIN_ID = 10143
 
+# RPC HTTP connection pool (shared keep-alive sockets for concurrent calls)
+RPC_POOL_SIZE = 32
+RPC_TIMEOUT = 10  # seconds
+
 # BlockVision API Configuration (Legacy - use Alchemy instead)
 BLOCKVISION_API_KEY = os.getenv('BLOCKVISION_API_KEY', '')
 
 # Alchemy API Configuration (Primary)
 ALCHEMY_MONAD_URL = os.getenv('ALCHEMY_MONAD_URL', 'https://monad-testnet.g.alchemy.com/v2/XNBMVXBwNDnoNZHXqcpzB')
 
+# GeckoTerminal token price API (both network slugs have been used for Monad testnet)
+GECKOTERMINAL_TOKEN_URLS = [
+    'https://api.geckoterminal.com/api/v2/networks/monad-testnet/tokens/{}',
+    'https://api.geckoterminal.com/api/v2/networks/monad_testnet/tokens/{}',
+]
+
+# Token prices are reused for this many seconds before being fetched again
+PRICE_CACHE_TTL = 30  # seconds
+
 # Block Explorer
 BLOCK_EXPLORER_URL = 'https://testnet.monadexplorer.com'
 BLOCK_EXPLORER_API_URL = os.getenv('BLOCK_EXPLORER_API_URL', '')
@@ -34,6 +54,16 @@ GAS_PRICE_MODES = {
     'very_fast': {'maxFeePerGas': 200, 'maxPriorityFeePerGas': 10}   # 4x base fee
 }
 
+# Floor for the estimated ERC20 transfer() gas limit (standard transfer to a new holder uses ~52k)
+# Every send is estimated - proxies and LSTs can need more than this
+ERC20_TRANSFER_GAS = 60000
+
+# Gas limit for a plain native MON transfer (fixed by the protocol)
+NATIVE_TRANSFER_GAS = 21000
+
+# Headroom applied to eth_estimateGas for ERC20 transfers (Monad charges the full limit)
+GAS_ESTIMATE_MULTIPLIER = 1.2
+
 # ERC-20 Token ABI (Standard Functions)
 ERC20_ABI = [
     {
@@ -146,6 +176,50 @@ DEX_ROUTER_ABI = [
     }
 ]
 
+# Multicall3 - same deterministic address on every EVM chain (deployed on Monad Testnet)
+MULTICALL3_ADDRESS = os.getenv('MULTICALL3_ADDRESS', '0xcA11bde05977b3631167028862bE2a173976CA11')
+
+# Max sub-calls per aggregate3 request (keeps a single eth_call under the RPC gas cap)
+MULTICALL_BATCH_SIZE = 400
+
+# Worker threads for per-token RPC fallback when batched reads are unavailable
+TOKEN_FETCH_WORKERS = 16
+
+# On-disk cache for ERC20 metadata (name/symbol/decimals are immutable)
+TOKEN_META_CACHE_PATH = os.getenv('TOKEN_META_CACHE_PATH', '.token_meta.db')
+
+# Multicall3 ABI (only aggregate3 is needed for batched reads)
+MULTICALL3_ABI = [
+    {
+        "inputs": [
+            {
+                "components": [
+                    {"internalType": "address", "name": "target", "type": "address"},
+                    {"internalType": "bool", "name": "allowFailure", "type": "bool"},
+                    {"internalType": "bytes", "name": "callData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Call3[]",
+                "name": "calls",
+                "type": "tuple[]"
+            }
+        ],
+        "name": "aggregate3",
+        "outputs": [
+            {
+                "components": [
+                    {"internalType": "bool", "name": "success", "type": "bool"},
+                    {"internalType": "bytes", "name": "returnData", "type": "bytes"}
+                ],
+                "internalType": "struct Multicall3.Result[]",
+                "name": "returnData",
+                "type": "tuple[]"
+            }
+        ],
+        "stateMutability": "payable",
+        "type": "function"
+    }
+]
+
 # WMON Address (Wrapped MONAD) - Correct address for Monad Testnet
 WETH_ADDRESS = '0x760afe86e5de5fa0ee542fc7b7b713e1c5425701'
 
@@ -233,6 +307,19 @@ VERIFIED_TOKENS = {
     '0x6c6a73cb3549c8480f08420ee2e5dfaf9d2d4cdb': 'LINK',
 }
 
+# Checksummed copies of VERIFIED_TOKENS, computed once at import (EIP-55 needs a keccak per address)
+# Malformed entries are skipped here instead of failing at every lookup site
+def _checksum_token_map(tokens: dict) -> dict:
+    checksummed = {}
+    for address, symbol in tokens.items():
+        try:
+            checksummed[Web3.to_checksum_address(address)] = symbol
+        except ValueError:
+            print(f"⚠️ Ignoring invalid verified token address for {symbol}: {address}")
+    return checksummed
+
+VERIFIED_TOKENS_CHECKSUM = _checksum_token_map(VERIFIED_TOKENS)
+
 # High value tokens (alternative check)
 HIGH_VALUE_TOKENS = ['MON', 'MONAD', 'WMON', 'USDC', 'USDT', 'WETH', 'WBTC']
 
@@ -5,7 +5,7 @@ Stores user data with encrypted private keys
 import os
 from datetime import datetime
 from typing import Optional, Dict, List
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Float, func, distinct
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from security import encrypt_private_key, decrypt_private_key
@@ -283,19 +283,27 @@ class DatabaseManager:
             return [token[0] for token in tokens]
         finally:
             session.close()
+    
+    def get_user_token_count(self, telegram_id: int) -> int:
+        """Count unique token addresses in user's history (cheap COUNT, no rows loaded)"""
+        session = self.get_session()
+        try:
+            return session.query(
+                func.count(distinct(TokenHistory.token_address))
+            ).filter(
+                TokenHistory.telegram_id == telegram_id
+            ).scalar() or 0
+        finally:
+            session.close()
 
 
-    def get_token_snapshot(self, telegram_id: int) -> Dict:
-        """Get last known token snapshot for user"""
+    def get_all_token_snapshots(self) -> Dict[int, Dict]:
+        """Get last known token snapshots of all users in one query (telegram_id -> snapshot)"""
         session = self.get_session()
         try:
-            snapshots = session.query(TokenSnapshot).filter(
-                TokenSnapshot.telegram_id == telegram_id
-            ).all()
-            
             result = {}
-            for snap in snapshots:
-                result[snap.token_symbol] = {
+            for snap in session.query(TokenSnapshot).all():
+                result.setdefault(snap.telegram_id, {})[snap.token_symbol] = {
                     'address': snap.token_address,
                     'balance': snap.balance,
                     'name': snap.token_name,
@@ -305,26 +313,34 @@ class DatabaseManager:
         finally:
             session.close()
     
-    def update_token_snapshot(self, telegram_id: int, tokens: Dict):
-        """Update token snapshot with current balances"""
+    def bulk_update_token_snapshots(self, snapshots: Dict[int, Dict]):
+        """
+        Replace the token snapshots of many users in one transaction
+        
+        Args:
+            snapshots: telegram_id -> tokens dict (symbol -> address, name, balance, verified)
+        """
+        if not snapshots:
+            return
+        
         session = self.get_session()
         try:
-            # Delete old snapshots for this user
             session.query(TokenSnapshot).filter(
-                TokenSnapshot.telegram_id == telegram_id
-            ).delete()
+                TokenSnapshot.telegram_id.in_(list(snapshots))
+            ).delete(synchronize_session=False)
             
-            # Insert new snapshots
-            for symbol, data in tokens.items():
-                snapshot = TokenSnapshot(
-                    telegram_id=telegram_id,
-                    token_address=data.get('address', ''),
-                    token_symbol=symbol,
-                    token_name=data.get('name', symbol),
-                    balance=str(data.get('balance', 0)),
-                    is_verified=1 if data.get('verified') else 0
-                )
-                session.add(snapshot)
+            session.bulk_insert_mappings(TokenSnapshot, [
+                {
+                    'telegram_id': telegram_id,
+                    'token_address': data.get('address', ''),
+                    'token_symbol': symbol,
+                    'token_name': data.get('name', symbol),
+                    'balance': str(data.get('balance', 0)),
+                    'is_verified': 1 if data.get('verified') else 0
+                }
+                for telegram_id, tokens in snapshots.items()
+                for symbol, data in tokens.items()
+            ])
             
             session.commit()
         finally:
@@ -3,7 +3,9 @@ MonadTrojan Bot - Main Bot File
 Secure Trading Bot for Monad Testnet
 """
 import asyncio
+import logging
 from datetime import datetime
+from logging.handlers import RotatingFileHandler
 from decimal import Decimal
 from typing import Dict, Optional
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
@@ -18,7 +20,7 @@ from config import (
     TELEGRAM_BOT_TOKEN, WELCOME_MESSAGE, WALLET_INFO_TEMPLATE,
     NATIVE_CURRENCY, QUICK_BUY_AMOUNTS, QUICK_SELL_PERCENTAGES,
     SLIPPAGE_OPTIONS, BLOCK_EXPLORER_URL, MONAD_TESTNET_RPC_URL,
-    DEX_ROUTER_ADDRESS
+    DEX_ROUTER_ADDRESS, LOG_FILE, LOG_LEVEL
 )
 from database import db_manager
 from blockchain import blockchain_manager
@@ -413,7 +415,7 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         
         return ConversationHandler.END
     
-    elif data == "nfts":
+    elif data in ("nfts", "nfts_refresh"):
         # Show NFT collection
         await handle_show_nfts(update, context)
         return ConversationHandler.END
@@ -527,9 +529,11 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
             return ConversationHandler.END
         
         token_address = user_context[user_id]['token_address']
-        info = blockchain_manager.get_token_info(token_address)
         user = db_manager.get_user(user_id)
-        balance, _ = blockchain_manager.get_token_balance(token_address, user.wallet_address)
+        info, (balance, _) = await asyncio.gather(
+            blockchain_manager.aget_token_info(token_address),
+            blockchain_manager.aget_token_balance(token_address, user.wallet_address)
+        )
         
         await query.edit_message_text(
             f"✏️ *Enter Amount {escape_markdown(info['symbol'])}*\n\n"
@@ -545,14 +549,15 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         token_address = data[5:]
         user_context[user_id] = {'action': 'sell', 'token_address': token_address}
         
-        info = blockchain_manager.get_token_info(token_address)
+        user = db_manager.get_user(user_id)
+        info, (balance, _) = await asyncio.gather(
+            blockchain_manager.aget_token_info(token_address),
+            blockchain_manager.aget_token_balance(token_address, user.wallet_address)
+        )
         if not info:
             await query.edit_message_text("❌ Failed to fetch token information\\.")
             return ConversationHandler.END
         
-        user = db_manager.get_user(user_id)
-        balance, _ = blockchain_manager.get_token_balance(token_address, user.wallet_address)
-        
         keyboard = []
         for percentage in QUICK_SELL_PERCENTAGES:
             amount = balance * Decimal(percentage) / Decimal(100)
@@ -584,8 +589,14 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         await query.edit_message_text("⏳ *Processing sell transaction\\.\\.\\.*", parse_mode=ParseMode.MARKDOWN_V2)
         
         user = db_manager.get_user(user_id)
-        balance, _ = blockchain_manager.get_token_balance(token_address, user.wallet_address)
-        amount_to_sell = balance * Decimal(percentage) / Decimal(100)
+        try:
+            balance_wei, decimals = blockchain_manager.get_token_balance_wei(token_address, user.wallet_address)
+        except Exception as e:
+            print(f"Error getting token balance: {e}")
+            balance_wei, decimals = 0, 18
+        # Integer math on wei: 100% sells the exact balance, no Decimal rounding dust
+        amount_to_sell_wei = balance_wei * percentage // 100
+        amount_to_sell = Decimal(amount_to_sell_wei) / Decimal(10) ** decimals
         
         settings = db_manager.get_user_settings(user_id)
         slippage = settings.slippage if settings else 1.0
@@ -595,7 +606,8 @@ async def button_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
         
         result = blockchain_manager.sell_token(
             token_address, amount_to_sell, user.wallet_address,
-            private_key, slippage, gas_mode
+            private_key, slippage, gas_mode,
+            amount_tokens_wei=amount_to_sell_wei
         )
         
         private_key = None
@@ -1510,8 +1522,23 @@ async def handle_transaction_passphrase(update: Update, context: ContextTypes.DE
     
     return ConversationHandler.END
 
+def setup_logging():
+    """Configure the root logger once (rotating log file + console)"""
+    logging.basicConfig(
+        level=LOG_LEVEL,
+        format='%(asctime)s %(levelname)s %(name)s: %(message)s',
+        handlers=[
+            RotatingFileHandler(LOG_FILE, maxBytes=5 * 1024 * 1024, backupCount=3),
+            logging.StreamHandler()
+        ]
+    )
+    # httpx logs every getUpdates poll at INFO
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+
 def main():
     """Start the bot"""
+    setup_logging()
+    
     if not TELEGRAM_BOT_TOKEN:
         print("❌ TELEGRAM_BOT_TOKEN not configured in .env file")
         return
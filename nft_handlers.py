@@ -1,7 +1,11 @@
 """
 NFT Handlers Module - Display and manage NFTs on Monad testnet
 """
-import requests
+import asyncio
+import logging
+import time
+from typing import Dict, Optional, Tuple
+import aiohttp
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes
 from telegram.constants import ParseMode
@@ -9,6 +13,62 @@ from config import ALCHEMY_MONAD_URL, BLOCK_EXPLORER_URL
 from database import db_manager
 from telegram.helpers import escape_markdown
 
+logger = logging.getLogger(__name__)
+
+# NFTs shown per gallery page, and fetched per Alchemy request
+NFTS_PER_PAGE = 5
+NFT_PAGE_SIZE = 25
+
+# Fixed gallery fragments (already MarkdownV2-safe)
+_GALLERY_HEADER = "🖼️ *Your NFT Collection*\n\n"
+_GALLERY_SEPARATOR = "━━━━━━━━━━━━━━━━━━━━\n\n"
+
+# Loaded NFT pages per wallet, reused for repeat views and pagination (wallet -> (fetched_at, state))
+_nft_cache: Dict[str, Tuple[float, Dict]] = {}
+NFT_CACHE_SECONDS = 60
+
+# Keep-alive session for the Alchemy NFT API (reuses TCP/TLS connections between fetches)
+# Created lazily because aiohttp sessions must be created inside the running event loop
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Get the shared aiohttp session, creating it on first use"""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=10),
+            timeout=aiohttp.ClientTimeout(total=10)
+        )
+    return _SESSION
+
+
+def _first(*values, default=''):
+    """Return the first truthy value (fallback chain over alternative API fields)"""
+    return next((value for value in values if value), default)
+
+
+async def _get_json(url: str, params: dict, retries: int = 2) -> Optional[dict]:
+    """
+    GET a JSON document without blocking the event loop
+    
+    Returns:
+        Parsed JSON or None on a non-200 response
+    """
+    session = await _get_session()
+    for attempt in range(retries + 1):
+        try:
+            async with session.get(url, params=params) as response:
+                if response.status != 200:
+                    logger.warning("Alchemy NFT API failed: HTTP %s", response.status)
+                    return None
+                return await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise
+            await asyncio.sleep(0.2 * 2 ** attempt)
+
+
 async def handle_show_nfts(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     """
     Display all NFTs owned by user
@@ -36,10 +96,11 @@ async def handle_show_nfts(update: Update, context: ContextTypes.DEFAULT_TYPE) -
     
     wallet_address = user.wallet_address
     
-    # Fetch NFTs using Alchemy API
-    nfts = await fetch_nfts_from_alchemy(wallet_address)
+    # Fetch the first page using Alchemy API (cached for a minute unless the user pressed Refresh)
+    force_refresh = query.data == "nfts_refresh"
+    nft_state = await get_wallet_nfts(wallet_address, NFTS_PER_PAGE, force_refresh=force_refresh)
     
-    if not nfts:
+    if not nft_state['nfts']:
         # No NFTs found
         keyboard = [[InlineKeyboardButton("🔙 Main Menu", callback_data="main_menu")]]
         await loading_msg.edit_text(
@@ -60,21 +121,75 @@ async def handle_show_nfts(update: Update, context: ContextTypes.DEFAULT_TYPE) -
         return
     
     # Display NFTs
-    await display_nft_gallery(loading_msg, nfts, wallet_address, page=0)
+    await display_nft_gallery(loading_msg, nft_state, wallet_address, page=0)
 
 
-async def fetch_nfts_from_alchemy(wallet_address: str) -> list:
+async def get_wallet_nfts(wallet_address: str, min_count: int, force_refresh: bool = False) -> Dict:
     """
-    Fetch NFTs owned by wallet using Alchemy NFT API v3 (REST endpoint)
+    Get NFTs for a wallet with at least min_count loaded (when the wallet has that many)
+    
+    Pages are fetched from Alchemy only when needed and cached for NFT_CACHE_SECONDS.
     
     Args:
         wallet_address: Wallet address to query
+        min_count: Number of NFTs the caller needs
+        force_refresh: Ignore cached NFTs
         
     Returns:
-        List of NFT objects with metadata
+        Dict with 'nfts' (loaded so far), 'page_key' (next Alchemy page or None) and 'total'
+    """
+    cache_key = wallet_address.lower()
+    cached = None if force_refresh else _nft_cache.get(cache_key)
+    
+    if cached and time.monotonic() - cached[0] < NFT_CACHE_SECONDS:
+        fetched_at, nft_state = cached
+    else:
+        nft_state = await fetch_nfts_from_alchemy(wallet_address)
+        if nft_state is None:
+            return {'nfts': [], 'page_key': None, 'total': 0}
+        fetched_at = time.monotonic()
+    
+    # Load further pages only when the requested range goes past what is loaded.
+    # Pages are collected into a new state (never into the cached one) so concurrent
+    # page loads for the same wallet can't append the same page twice.
+    nfts = nft_state['nfts']
+    page_key = nft_state['page_key']
+    while len(nfts) < min_count and page_key:
+        next_page = await fetch_nfts_from_alchemy(wallet_address, page_key=page_key)
+        if next_page is None:
+            break
+        nfts = nfts + next_page['nfts']
+        page_key = next_page['page_key']
+    
+    if nfts is not nft_state['nfts']:
+        nft_state = {'nfts': nfts, 'page_key': page_key, 'total': nft_state['total']}
+    _store_nfts(cache_key, fetched_at, nft_state)
+    return nft_state
+
+
+def _store_nfts(cache_key: str, fetched_at: float, nft_state: Dict):
+    """Cache a wallet's NFT state, dropping expired wallets so the cache stays bounded"""
+    now = time.monotonic()
+    expired = [key for key, (cached_at, _) in _nft_cache.items() if now - cached_at >= NFT_CACHE_SECONDS]
+    for key in expired:
+        del _nft_cache[key]
+    _nft_cache[cache_key] = (fetched_at, nft_state)
+
+
+async def fetch_nfts_from_alchemy(wallet_address: str, page_key: Optional[str] = None) -> Optional[Dict]:
+    """
+    Fetch one page of NFTs owned by wallet using Alchemy NFT API v3 (REST endpoint)
+    
+    Args:
+        wallet_address: Wallet address to query
+        page_key: Alchemy pageKey of the page to fetch (None for the first page)
+        
+    Returns:
+        Dict with 'nfts' (NFT objects with metadata), 'page_key' (next page or None)
+        and 'total', or None on error
     """
     try:
-        print(f"🔍 Fetching NFTs for {wallet_address}...")
+        logger.debug("Fetching NFTs for %s", wallet_address)
         
         # Extract API key from ALCHEMY_MONAD_URL
         # Format: https://monad-testnet.g.alchemy.com/v2/API_KEY
@@ -90,57 +205,59 @@ async def fetch_nfts_from_alchemy(wallet_address: str) -> list:
         params = {
             'owner': wallet_address,
             'withMetadata': 'true',
-            'pageSize': '100'
+            'pageSize': str(NFT_PAGE_SIZE)
         }
+        if page_key:
+            params['pageKey'] = page_key
         
-        response = requests.get(endpoint, params=params, timeout=10)
+        data = await _get_json(endpoint, params)
         
-        if response.ok:
-            data = response.json()
-            
+        if data is not None:
             # REST API v3 structure: { "ownedNfts": [...], "totalCount": X, "pageKey": ... }
             # NOT wrapped in "result" like JSON-RPC
             owned_nfts = data.get('ownedNfts', data.get('nfts', []))
-            total_count = data.get('totalCount', len(owned_nfts))
+            total_count = int(data.get('totalCount') or len(owned_nfts))
             
-            print(f"✅ Alchemy NFT API v3: Found {total_count} NFTs")
+            logger.debug("Alchemy NFT API v3: found %d NFTs", total_count)
             
             # Parse and format NFT data
             nfts = []
             for nft in owned_nfts:
-                # v3 structure can vary: contract, contractMetadata, etc
-                contract = nft.get('contract', nft.get('contractMetadata', {}))
+                # v3 structure can vary: contract, contractMetadata, etc (each read once)
+                contract_metadata = nft.get('contractMetadata', {})
+                raw_metadata = nft.get('rawMetadata', {})
+                contract = nft.get('contract', contract_metadata)
+                nft_id = nft.get('id', '?')
                 
                 # Get contract address from multiple possible locations
-                contract_addr = (
-                    contract.get('address') or 
-                    nft.get('contractAddress') or 
-                    nft.get('contract', {}).get('contractAddress', '')
+                contract_addr = _first(
+                    contract.get('address'),
+                    nft.get('contractAddress'),
+                    contract.get('contractAddress')
                 )
                 
                 # Get symbol from multiple possible locations
-                symbol = (
-                    contract.get('symbol') or 
-                    nft.get('contractMetadata', {}).get('symbol') or
-                    nft.get('rawMetadata', {}).get('symbol') or
-                    ''
+                symbol = _first(
+                    contract.get('symbol'),
+                    contract_metadata.get('symbol'),
+                    raw_metadata.get('symbol')
                 )
                 
                 # Get name from multiple possible locations
-                contract_name = (
-                    contract.get('name') or 
-                    nft.get('contractMetadata', {}).get('name') or
-                    nft.get('rawMetadata', {}).get('name') or
-                    'Unknown'
+                contract_name = _first(
+                    contract.get('name'),
+                    contract_metadata.get('name'),
+                    raw_metadata.get('name'),
+                    default='Unknown'
                 )
                 
                 # Get token ID - prefer decoded over hex
-                token_id = (
-                    nft.get('tokenIdDecoded') or
-                    nft.get('tokenId') or
-                    nft.get('id', {}).get('tokenId') or
-                    nft.get('tokenIdHex') or
-                    nft.get('id', '?')
+                token_id = _first(
+                    nft.get('tokenIdDecoded'),
+                    nft.get('tokenId'),
+                    nft_id.get('tokenId') if isinstance(nft_id, dict) else None,
+                    nft.get('tokenIdHex'),
+                    default=nft_id
                 )
                 
                 # Get metadata (can be in different places)
@@ -163,59 +280,64 @@ async def fetch_nfts_from_alchemy(wallet_address: str) -> list:
                 
                 nfts.append(nft_data)
             
-            return nfts
+            return {
+                'nfts': nfts,
+                'page_key': data.get('pageKey'),
+                'total': total_count
+            }
         else:
-            print(f"⚠️ Alchemy API failed: {response.status_code}")
-            return []
+            return None
             
-    except Exception as e:
-        print(f"❌ Error fetching NFTs: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+    except Exception:
+        logger.exception("Error fetching NFTs for %s", wallet_address)
+        return None
 
 
-async def display_nft_gallery(message, nfts: list, wallet_address: str, page: int = 0):
+async def display_nft_gallery(message, nft_state: Dict, wallet_address: str, page: int = 0):
     """
     Display NFT gallery with pagination
     
     Args:
         message: Telegram message to edit
-        nfts: List of NFT objects
+        nft_state: NFT state from get_wallet_nfts (must have this page loaded)
         wallet_address: Wallet address
         page: Current page number (0-indexed)
     """
-    total_nfts = len(nfts)
-    nfts_per_page = 5
+    nfts = nft_state['nfts']
+    total_nfts = max(nft_state['total'], len(nfts))
+    nfts_per_page = NFTS_PER_PAGE
     total_pages = (total_nfts + nfts_per_page - 1) // nfts_per_page
     
     # Get NFTs for current page
     start_idx = page * nfts_per_page
-    end_idx = min(start_idx + nfts_per_page, total_nfts)
+    end_idx = min(start_idx + nfts_per_page, len(nfts))
     page_nfts = nfts[start_idx:end_idx]
     
-    # Build message text
-    text = f"🖼️ *Your NFT Collection*\n\n"
-    text += f"📍 Address: `{escape_markdown(wallet_address[:10])}...{escape_markdown(wallet_address[-8:])}`\n"
-    text += f"🎨 Total NFTs: *{escape_markdown(str(total_nfts))}*\n"
-    text += f"📄 Page {page + 1} of {total_pages}\n\n"
-    text += "━━━━━━━━━━━━━━━━━━━━\n\n"
+    # Build message text (fragments joined once at the end)
+    parts = [
+        _GALLERY_HEADER,
+        f"📍 Address: `{escape_markdown(wallet_address[:10])}...{escape_markdown(wallet_address[-8:])}`\n",
+        f"🎨 Total NFTs: *{total_nfts}*\n",
+        f"📄 Page {page + 1} of {total_pages}\n\n",
+        _GALLERY_SEPARATOR
+    ]
     
     # Add NFT details
     for i, nft in enumerate(page_nfts, start=start_idx + 1):
         collection = nft.get('contract_name', 'Unknown')
         name = nft.get('name', f"#{nft.get('token_id', '?')}")
-        token_id = nft.get('token_id', '?')
+        token_id = str(nft.get('token_id', '?'))
         
-        text += f"*{i}\\. {escape_markdown(collection)}*\n"
-        text += f"   🏷️ {escape_markdown(name)}\n"
-        text += f"   🔢 Token ID: `{escape_markdown(str(token_id))}`\n"
+        parts.append(f"*{i}\\. {escape_markdown(collection)}*\n")
+        parts.append(f"   🏷️ {escape_markdown(name)}\n")
+        # Decimal token IDs have nothing to escape
+        parts.append(f"   🔢 Token ID: `{token_id if token_id.isdigit() else escape_markdown(token_id)}`\n")
         
         # Add description if available (truncate if too long)
         description = nft.get('description', '')
-        if description and len(description) > 0:
+        if description:
             desc_short = description[:80] + "..." if len(description) > 80 else description
-            text += f"   📝 {escape_markdown(desc_short)}\n"
+            parts.append(f"   📝 {escape_markdown(desc_short)}\n")
         
         # Add image link if available
         image_url = nft.get('image', '')
@@ -223,15 +345,17 @@ async def display_nft_gallery(message, nfts: list, wallet_address: str, page: in
             # Handle IPFS URLs
             if image_url.startswith('ipfs://'):
                 image_url = image_url.replace('ipfs://', 'https://ipfs.io/ipfs/')
-            text += f"   🖼️ [View Image]({escape_markdown(image_url)})\n"
+            parts.append(f"   🖼️ [View Image]({escape_markdown(image_url)})\n")
         
         # Add explorer link
         contract_address = nft.get('contract_address', '')
         if contract_address and BLOCK_EXPLORER_URL:
             explorer_link = f"{BLOCK_EXPLORER_URL}/token/{contract_address}?a={token_id}"
-            text += f"   🔗 [View on Explorer]({escape_markdown(explorer_link)})\n"
+            parts.append(f"   🔗 [View on Explorer]({escape_markdown(explorer_link)})\n")
         
-        text += "\n"
+        parts.append("\n")
+    
+    text = "".join(parts)
     
     # Build pagination keyboard
     keyboard = []
@@ -248,7 +372,7 @@ async def display_nft_gallery(message, nfts: list, wallet_address: str, page: in
     
     # Action buttons
     action_row = [
-        InlineKeyboardButton("🔄 Refresh", callback_data="nfts"),
+        InlineKeyboardButton("🔄 Refresh", callback_data="nfts_refresh"),
         InlineKeyboardButton("🔙 Main Menu", callback_data="main_menu")
     ]
     keyboard.append(action_row)
@@ -262,7 +386,7 @@ async def display_nft_gallery(message, nfts: list, wallet_address: str, page: in
             disable_web_page_preview=True
         )
     except Exception as e:
-        print(f"⚠️ Error displaying NFT gallery: {e}")
+        logger.warning("Error displaying NFT gallery: %s", e)
         # Fallback without markdown
         await message.edit_text(
             "🖼️ Your NFT Collection\n\n"
@@ -290,18 +414,12 @@ async def handle_nft_pagination(update: Update, context: ContextTypes.DEFAULT_TY
         await query.edit_message_text("❌ Wallet not found\\. Please use /start")
         return
     
-    # Fetch NFTs again (or cache them in context.user_data)
+    # NFTs come from the per-wallet cache, the next Alchemy page is fetched only if needed
     wallet_address = user.wallet_address
-    
-    # Check if NFTs are cached
-    if 'nfts' in context.user_data:
-        nfts = context.user_data['nfts']
-    else:
-        nfts = await fetch_nfts_from_alchemy(wallet_address)
-        context.user_data['nfts'] = nfts
+    nft_state = await get_wallet_nfts(wallet_address, (page + 1) * NFTS_PER_PAGE)
     
     # Display page
-    await display_nft_gallery(query.message, nfts, wallet_address, page=page)
+    await display_nft_gallery(query.message, nft_state, wallet_address, page=page)
 
 
 async def send_nft_image(update: Update, context: ContextTypes.DEFAULT_TYPE, nft_index: int) -> None:
@@ -320,9 +438,9 @@ async def send_nft_image(update: Update, context: ContextTypes.DEFAULT_TYPE, nft
     if not user:
         return
     
-    # Fetch NFTs
+    # Fetch NFTs (served from cache when the gallery was just shown)
     wallet_address = user.wallet_address
-    nfts = await fetch_nfts_from_alchemy(wallet_address)
+    nfts = (await get_wallet_nfts(wallet_address, nft_index + 1))['nfts']
     
     if nft_index >= len(nfts):
         await update.message.reply_text("❌ NFT not found")
@@ -351,7 +469,7 @@ async def send_nft_image(update: Update, context: ContextTypes.DEFAULT_TYPE, nft
             caption=caption
         )
     except Exception as e:
-        print(f"❌ Error sending NFT image: {e}")
+        logger.warning("Error sending NFT image: %s", e)
         await update.message.reply_text(
             f"❌ Could not load image.\n\n"
             f"View online: {image_url}"
@@ -3,16 +3,97 @@ Notification Monitor - Background task to monitor wallet for new tokens
 Sends Telegram notifications when new verified tokens are detected
 """
 import asyncio
-from typing import List, Dict, Optional
+import json
+import logging
+import sys
+from decimal import Decimal, InvalidOperation
+from functools import lru_cache
+from typing import Callable, List, Dict, FrozenSet, Optional, Set
+import aiohttp
+import orjson
+import websockets
+from web3 import Web3
 from telegram import Bot
 from telegram.constants import ParseMode
 from blockchain import blockchain_manager
 from database import db_manager
-from config import BLOCK_EXPLORER_URL, MONAD_TESTNET_RPC_URL
-from web3 import Web3
+from config import ALCHEMY_MONAD_URL, BLOCK_EXPLORER_URL, MONAD_TESTNET_WSS_URL, VERIFIED_TOKENS_CHECKSUM
+
+logger = logging.getLogger(__name__)
+
+# Blocks searched back when looking up the transaction of a received amount (~25 min on Monad)
+TX_LOOKBACK_BLOCKS = 500
+
+# Wallets checked at the same time in each monitor cycle (bounds Alchemy/RPC load)
+MONITOR_CONCURRENCY = 20
+
+# Monitor cycles between full token scans of wallets whose fingerprint did not change
+# (catches new tokens that are only verified by symbol and so are not part of the fingerprint)
+FULL_SCAN_CYCLES = 10
+
+# Last known token snapshot per user (telegram_id -> snapshot), loaded once from the database
+# and kept in memory, the database copy is only written when a snapshot changes
+_snapshot_cache: Dict[int, Dict] = {}
+
+# ERC20 Transfer(address,address,uint256) event topic, topics[2] is the padded recipient
+TRANSFER_TOPIC = Web3.to_hex(Web3.keccak(text='Transfer(address,address,uint256)'))
+
+# Users with a wallet check currently running (poll and push triggers never overlap per user)
+_checks_in_progress: Set[int] = set()
+
+# Smallest balance increase that triggers a notification (ignores rounding noise from APIs)
+MIN_BALANCE_INCREASE = Decimal('0.0001')
+
+# Symbols of the native coin in token dicts
+_NATIVE_SYMBOLS = frozenset({'MON', 'MONAD'})
+
+# Placeholder address of native MON in token dicts (has no ERC20 balance to read)
+NATIVE_TOKEN_ADDRESS = '0x0000000000000000000000000000000000000000'
+
+# Wallet fingerprint at the last completed check per user (telegram_id -> fingerprint)
+_wallet_fingerprints: Dict[int, tuple] = {}
+
+# Wallet lookups shared by all users checked in the current poll cycle ((kind, wallet, ...) -> task),
+# so users sharing a wallet hit Alchemy once per cycle. Cleared at the start of every cycle.
+_cycle_lookups: Dict[tuple, asyncio.Task] = {}
+
+# Snapshots changed since the last database flush (telegram_id -> tokens), written once per cycle
+_dirty_snapshots: Dict[int, Dict] = {}
+
+# Keep-alive session for Alchemy calls (reuses TCP/TLS connections between checks)
+# Created lazily because aiohttp sessions must be created inside the running event loop
+_SESSION: Optional[aiohttp.ClientSession] = None
+
+
+async def _get_session() -> aiohttp.ClientSession:
+    """Get the shared aiohttp session, creating it on first use"""
+    global _SESSION
+    if _SESSION is None or _SESSION.closed:
+        _SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=50, keepalive_timeout=60),
+            timeout=aiohttp.ClientTimeout(total=5)
+        )
+    return _SESSION
+
+
+async def _alchemy_post(payload):
+    """
+    POST a JSON-RPC payload (single request or batch list) to Alchemy without blocking the event loop
+    
+    Returns:
+        Parsed JSON (a list for batch payloads) or None on a non-200 response
+    """
+    session = await _get_session()
+    async with session.post(
+        ALCHEMY_MONAD_URL,
+        data=orjson.dumps(payload),
+        headers={'Content-Type': 'application/json'}
+    ) as response:
+        if response.status != 200:
+            logger.warning("Alchemy API failed: HTTP %s", response.status)
+            return None
+        return orjson.loads(await response.read())
 
-# Web3 instance for transaction queries
-w3 = Web3(Web3.HTTPProvider(MONAD_TESTNET_RPC_URL))
 
 async def find_recent_transaction(wallet_address: str, amount: float) -> Optional[str]:
     """
@@ -26,124 +107,193 @@ async def find_recent_transaction(wallet_address: str, amount: float) -> Optiona
         Transaction hash if found, None otherwise
     """
     try:
-        # Get latest block
-        latest_block = w3.eth.block_number
+        latest_block = await blockchain_manager.aw3.eth.block_number
         
-        # Check last 500 blocks for incoming transactions (covers ~25 min on Monad)
-        for block_num in range(latest_block, max(latest_block - 500, 0), -1):
-            try:
-                block = w3.eth.get_block(block_num, full_transactions=True)
-                
-                for tx in block.transactions:
-                    # Check if transaction is TO our wallet
-                    if tx['to'] and tx['to'].lower() == wallet_address.lower():
-                        # Check if it's a native transfer (not contract call)
-                        if tx['input'] == '0x' or tx['input'] == '0x0':
-                            # Convert value from wei to MON
-                            tx_amount = float(w3.from_wei(tx['value'], 'ether'))
-                            
-                            # Match with tolerance (0.0001 MON)
-                            if abs(tx_amount - amount) < 0.0001:
-                                return tx['hash'].hex()
-            except Exception as e:
-                continue
+        # One getAssetTransfers call over the lookback window instead of a get_block per block
+        data = await _alchemy_post({
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "alchemy_getAssetTransfers",
+            "params": [{
+                "fromBlock": hex(max(latest_block - TX_LOOKBACK_BLOCKS, 0)),
+                "toAddress": wallet_address,
+                "category": ["external"],  # Native MON transfers only
+                "order": "desc",
+                "maxCount": "0x32"
+            }]
+        })
+        if not data or 'result' not in data:
+            return None
+        
+        for tx in data['result'].get('transfers', []):
+            # Match with tolerance (0.0001 MON)
+            if abs(float(tx.get('value') or 0) - amount) < 0.0001:
+                return tx.get('hash')
         
         return None
     except Exception as e:
         print(f"⚠️ Error finding transaction: {e}")
         return None
 
+# MarkdownV2 special characters mapped to their escaped form (one translate pass per string)
+_MARKDOWN_V2_ESCAPES = str.maketrans({char: '\\' + char for char in '_*[]()~`>#+-=|{}.!'})
+
 def escape_markdown(text: str) -> str:
     """Escape special characters for MarkdownV2"""
-    text = str(text)
-    replacements = {
-        '_': '\\_', '*': '\\*', '[': '\\[', ']': '\\]',
-        '(': '\\(', ')': '\\)', '~': '\\~', '`': '\\`',
-        '>': '\\>', '#': '\\#', '+': '\\+', '-': '\\-',
-        '=': '\\=', '|': '\\|', '{': '\\{', '}': '\\}',
-        '.': '\\.', '!': '\\!'
-    }
-    for char, escaped in replacements.items():
-        text = text.replace(char, escaped)
-    return text
+    return str(text).translate(_MARKDOWN_V2_ESCAPES)
 
-async def send_token_notification(bot: Bot, user_id: int, new_tokens: List[Dict]):
+def _format_token_notification(token: Dict, user_id: int, wallet_address: Optional[str] = None) -> str:
+    """Build the MarkdownV2 notification text for one received token"""
+    symbol = token.get('symbol', 'Unknown')
+    name = token.get('name', symbol)
+    balance = token.get('balance', 0)
+    address = token.get('address', '')
+    balance_increase = token.get('balance_increase')  # For native MON
+    
+    balance_text = escape_markdown(f'{balance:.4f}')
+    
+    # Build message
+    if balance_increase:
+        # Token received (MON or other verified token)
+        symbol = token.get('symbol', 'Token')
+        increase_text = escape_markdown(f'{balance_increase:.4f}')
+        
+        if symbol in _NATIVE_SYMBOLS:
+            # Native MON
+            parts = [
+                "💰 *MON Received\\!*\n\n",
+                f"*Amount:* `\\+{increase_text} MON`\n",
+                f"*New Balance:* `{balance_text} MON`\n"
+            ]
+        else:
+            # Other verified token
+            symbol_text = escape_markdown(symbol)
+            parts = [
+                f"💰 *{escape_markdown(name)} Received\\!*\n\n",
+                f"*Token:* {symbol_text}\n",
+                f"*Amount:* `\\+{increase_text} {symbol_text}`\n",
+                f"*New Balance:* `{balance_text} {symbol_text}`\n"
+            ]
+        
+        # Add explorer link for transaction
+        tx_hash = token.get('tx_hash')
+        if tx_hash and BLOCK_EXPLORER_URL:
+            explorer_link = f"{BLOCK_EXPLORER_URL}/tx/{tx_hash}"
+            parts.append(f"\n🔗 [View Transaction]({explorer_link})")
+        elif BLOCK_EXPLORER_URL:
+            # Fallback to wallet if no tx hash found
+            if wallet_address is None:
+                user_obj = db_manager.get_user(user_id)
+                wallet_address = user_obj.wallet_address if user_obj else None
+            if wallet_address:
+                explorer_link = f"{BLOCK_EXPLORER_URL}/address/{wallet_address}"
+                parts.append(f"\n🔗 [View Wallet on Explorer]({explorer_link})")
+    else:
+        # New token received
+        symbol_text = escape_markdown(symbol)
+        parts = ["🎉 *New Token Received\\!*\n\n", f"*Token:* {symbol_text}"]
+        
+        if name != symbol:
+            parts.append(f" \\({escape_markdown(name)}\\)")
+        
+        parts.append(f"\n*Amount:* `{balance_text} {symbol_text}`\n")
+        
+        # Add explorer link for transaction (TX hash preferred)
+        tx_hash = token.get('tx_hash')
+        if tx_hash and BLOCK_EXPLORER_URL:
+            explorer_link = f"{BLOCK_EXPLORER_URL}/tx/{tx_hash}"
+            parts.append(f"\n🔗 [View Transaction]({explorer_link})")
+        elif address and BLOCK_EXPLORER_URL:
+            # Fallback to token page if no TX found
+            explorer_link = f"{BLOCK_EXPLORER_URL}/token/{address}"
+            parts.append(f"\n🔗 [View on Explorer]({explorer_link})")
+    
+    return ''.join(parts)
+
+async def send_token_notification(bot: Bot, user_id: int, new_tokens: List[Dict],
+                                  wallet_address: Optional[str] = None):
     """
-    Send notification about new tokens received
+    Send notification about new tokens received (all messages sent concurrently)
     
     Args:
         bot: Telegram Bot instance
         user_id: Telegram user ID
         new_tokens: List of new token data dicts
+        wallet_address: User's wallet address (looked up in the database if not given)
     """
-    for token in new_tokens:
-        symbol = token.get('symbol', 'Unknown')
-        name = token.get('name', symbol)
-        balance = token.get('balance', 0)
-        address = token.get('address', '')
-        balance_increase = token.get('balance_increase')  # For native MON
-        
-        # Build message
-        if balance_increase:
-            # Token received (MON or other verified token)
-            symbol = token.get('symbol', 'Token')
-            
-            if symbol in ['MON', 'MONAD']:
-                # Native MON
-                message = f"💰 *MON Received\\!*\n\n"
-                message += f"*Amount:* `\\+{escape_markdown(f'{balance_increase:.4f}')} MON`\n"
-                message += f"*New Balance:* `{escape_markdown(f'{balance:.4f}')} MON`\n"
-            else:
-                # Other verified token
-                message = f"💰 *{escape_markdown(name)} Received\\!*\n\n"
-                message += f"*Token:* {escape_markdown(symbol)}\n"
-                message += f"*Amount:* `\\+{escape_markdown(f'{balance_increase:.4f}')} {escape_markdown(symbol)}`\n"
-                message += f"*New Balance:* `{escape_markdown(f'{balance:.4f}')} {escape_markdown(symbol)}`\n"
-            
-            # Add explorer link for transaction
-            tx_hash = token.get('tx_hash')
-            if tx_hash and BLOCK_EXPLORER_URL:
-                explorer_link = f"{BLOCK_EXPLORER_URL}/tx/{tx_hash}"
-                message += f"\n🔗 [View Transaction]({explorer_link})"
-            elif BLOCK_EXPLORER_URL:
-                # Fallback to wallet if no tx hash found
-                from database import db_manager as db
-                user_obj = db.get_user(user_id)
-                if user_obj:
-                    explorer_link = f"{BLOCK_EXPLORER_URL}/address/{user_obj.wallet_address}"
-                    message += f"\n🔗 [View Wallet on Explorer]({explorer_link})"
-        else:
-            # New token received
-            message = f"🎉 *New Token Received\\!*\n\n"
-            message += f"*Token:* {escape_markdown(symbol)}"
-            
-            if name != symbol:
-                message += f" \\({escape_markdown(name)}\\)"
-            
-            message += f"\n*Amount:* `{escape_markdown(f'{balance:.4f}')} {escape_markdown(symbol)}`\n"
-            
-            # Add explorer link for transaction (TX hash preferred)
-            tx_hash = token.get('tx_hash')
-            if tx_hash and BLOCK_EXPLORER_URL:
-                explorer_link = f"{BLOCK_EXPLORER_URL}/tx/{tx_hash}"
-                message += f"\n🔗 [View Transaction]({explorer_link})"
-            elif address and BLOCK_EXPLORER_URL:
-                # Fallback to token page if no TX found
-                explorer_link = f"{BLOCK_EXPLORER_URL}/token/{address}"
-                message += f"\n🔗 [View on Explorer]({explorer_link})"
-        
-        try:
-            await bot.send_message(
+    results = await asyncio.gather(
+        *(
+            bot.send_message(
                 chat_id=user_id,
-                text=message,
+                text=_format_token_notification(token, user_id, wallet_address),
                 parse_mode=ParseMode.MARKDOWN_V2,
                 disable_web_page_preview=True
             )
+            for token in new_tokens
+        ),
+        return_exceptions=True
+    )
+    
+    for token, result in zip(new_tokens, results):
+        symbol = token.get('symbol', 'Unknown')
+        if isinstance(result, Exception):
+            print(f"⚠️ Failed to send notification to {user_id}: {result}")
+        else:
             print(f"✅ Notification sent to {user_id}: {symbol}")
-        except Exception as e:
-            print(f"⚠️ Failed to send notification to {user_id}: {e}")
 
-async def check_user_for_new_tokens(bot: Bot, user, wallet_address: str):
+def _cycle_lookup(key: tuple, fetch: Callable) -> asyncio.Task:
+    """Start fetch() once per key in the current poll cycle, later callers await the same task"""
+    task = _cycle_lookups.get(key)
+    if task is None:
+        task = asyncio.ensure_future(fetch())
+        _cycle_lookups[key] = task
+    return task
+
+async def _fetch_recent_transfers(wallet_address: str, categories: List[str]) -> Dict[str, List[Dict]]:
+    """
+    Get the latest incoming transfers for several categories in one JSON-RPC batch request
+    
+    Args:
+        wallet_address: Wallet address
+        categories: Alchemy transfer categories (e.g. "external", "erc20")
+        
+    Returns:
+        Transfers by category, most recent first (empty list for a failed query)
+    """
+    payload = [
+        {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "alchemy_getAssetTransfers",
+            "params": [{
+                "toAddress": wallet_address,
+                "category": [category],
+                "order": "desc",  # Most recent first
+                "maxCount": "0xa",  # Last 10 transactions
+                "withMetadata": True
+            }]
+        }
+        for request_id, category in enumerate(categories)
+    ]
+    transfers = {category: [] for category in categories}
+    
+    data = await _alchemy_post(payload)
+    if not isinstance(data, list):
+        print(f"⚠️ Alchemy batch response invalid: {data}")
+        return transfers
+    
+    # Batch responses may come back in any order, match them by id
+    for item in data:
+        request_id = item.get('id')
+        if 'result' in item and isinstance(request_id, int) and 0 <= request_id < len(categories):
+            transfers[categories[request_id]] = item['result'].get('transfers', [])
+        else:
+            print(f"⚠️ Alchemy response missing result: {item}")
+    
+    return transfers
+
+async def check_user_for_new_tokens(bot: Bot, user, wallet_address: str, full_scan: bool = False,
+                                    shared: bool = False):
     """
     Check a single user's wallet for new verified tokens
     
@@ -151,254 +301,401 @@ async def check_user_for_new_tokens(bot: Bot, user, wallet_address: str):
         bot: Telegram Bot instance
         user: User object from database
         wallet_address: User's wallet address
+        full_scan: Scan all tokens even if the wallet fingerprint is unchanged
+        shared: Reuse wallet lookups already made in this poll cycle (users sharing a wallet)
     """
     try:
         telegram_id = user.telegram_id
         
+        # One batched read of native balance, nonce and known token balances, an idle wallet stops here
+        snapshot = _snapshot_cache.get(telegram_id) or {}
+        fingerprint = await asyncio.to_thread(
+            blockchain_manager.get_wallet_fingerprint,
+            wallet_address,
+            [*VERIFIED_TOKENS_CHECKSUM, *(
+                data['address'] for data in snapshot.values()
+                if data.get('address') and data['address'] != NATIVE_TOKEN_ADDRESS
+            )]
+        )
+        if not full_scan and fingerprint is not None and _wallet_fingerprints.get(telegram_id) == fingerprint:
+            return
+        
         # Get current tokens from blockchain
-        current_tokens = blockchain_manager.get_wallet_all_tokens(wallet_address)
+        if shared:
+            tokens = await _cycle_lookup(
+                ('tokens', wallet_address.lower()),
+                lambda: blockchain_manager.aget_wallet_all_tokens(wallet_address)
+            )
+            # Per-user copy, the diff below annotates token dicts
+            current_tokens = {symbol: dict(data) for symbol, data in tokens.items()}
+        else:
+            current_tokens = await blockchain_manager.aget_wallet_all_tokens(wallet_address)
         
         if not current_tokens:
             return
         
         # Get last known snapshot
-        last_snapshot = db_manager.get_token_snapshot(telegram_id)
+        last_snapshot = _snapshot_cache.get(telegram_id)
         
         # If first run (empty snapshot), just initialize and skip notifications
         if not last_snapshot:
-            print(f"📸 First run for user {telegram_id}: Initializing snapshot (no notifications)")
-            db_manager.update_token_snapshot(telegram_id, current_tokens)
+            logger.info("First run for user %s: initializing snapshot (no notifications)", telegram_id)
+            _save_snapshot(telegram_id, current_tokens)
+            _wallet_fingerprints[telegram_id] = fingerprint
             return
         
         # Find new verified tokens OR native MON increase
         new_tokens = []
-        print(f"🔍 Comparing {len(current_tokens)} current tokens with {len(last_snapshot)} snapshot tokens for user {telegram_id}")
+        logger.debug("Comparing %d current tokens with %d snapshot tokens for user %s",
+                     len(current_tokens), len(last_snapshot), telegram_id)
         
-        for symbol, token_data in current_tokens.items():
-            # Check if token is new (not in last snapshot)
-            is_new = symbol not in last_snapshot
-            
-            # Debug: Log token check
-            if is_new and token_data.get('verified'):
-                print(f"  🆕 Found NEW verified token: {symbol} (balance: {token_data.get('balance')})")
-            
-            # For native MON, check if balance increased
-            if symbol in ['MON', 'MONAD']:
-                if not is_new and symbol in last_snapshot:
-                    old_balance = float(last_snapshot[symbol].get('balance', 0))
-                    new_balance = float(token_data.get('balance', 0))
-                    # Only notify if balance increased significantly (ignore precision errors)
-                    # Minimum threshold: 0.0001 MON to avoid false positives
-                    if new_balance > old_balance + 0.0001:
-                        balance_increase = new_balance - old_balance
-                        token_data['balance_increase'] = balance_increase
-                        
-                        # Try to find the transaction hash using Alchemy API (fast & reliable)
-                        try:
-                            import requests
-                            from config import ALCHEMY_MONAD_URL
-                            
-                            # Use Alchemy getAssetTransfers to get recent transactions
-                            payload = {
-                                "jsonrpc": "2.0",
-                                "id": 1,
-                                "method": "alchemy_getAssetTransfers",
-                                "params": [{
-                                    "toAddress": wallet_address,
-                                    "category": ["external"],  # Native MON transfers only
-                                    "order": "desc",  # Most recent first
-                                    "maxCount": "0xa",  # Last 10 transactions
-                                    "withMetadata": True
-                                }]
-                            }
-                            
-                            response = requests.post(ALCHEMY_MONAD_URL, json=payload, timeout=5)
-                            
-                            if response.ok:
-                                data = response.json()
-                                if 'result' in data:
-                                    transfers = data['result'].get('transfers', [])
-                                    
-                                    # Find transaction matching the balance increase
-                                    for tx in transfers:
-                                        tx_value = float(tx.get('value', 0))
-                                        # Match with tolerance (0.001 MON)
-                                        if abs(tx_value - balance_increase) < 0.001:
-                                            token_data['tx_hash'] = tx.get('hash')
-                                            print(f"🔔 Found TX via Alchemy: {tx.get('hash')}")
-                                            break
-                                else:
-                                    print(f"⚠️ Alchemy response missing result: {data}")
-                            else:
-                                print(f"⚠️ Alchemy API failed: {response.status_code}")
-                                
-                        except Exception as e:
-                            print(f"⚠️ Could not fetch TX hash: {e}")
-                        
-                        new_tokens.append(token_data)
-                        print(f"🔔 Native MON received for user {telegram_id}: +{balance_increase} MON")
+        new_symbols = current_tokens.keys() - last_snapshot.keys()
+        held_symbols = current_tokens.keys() & last_snapshot.keys()
+        
+        # Tokens already held: notify on a balance increase (native MON, or verified tokens)
+        for symbol in held_symbols:
+            token_data = current_tokens[symbol]
+            is_native = symbol in _NATIVE_SYMBOLS
+            if not is_native and not token_data.get('verified'):
                 continue
             
-            # For other tokens: only notify for verified tokens
+            # Snapshot balances are already Decimal, exact comparison without float conversions
+            old_balance = last_snapshot[symbol]['balance']
+            new_balance = _to_decimal(token_data.get('balance', 0))
+            if new_balance > old_balance + MIN_BALANCE_INCREASE:
+                balance_increase = new_balance - old_balance
+                token_data['balance_increase'] = balance_increase
+                new_tokens.append(token_data)
+                if is_native:
+                    logger.info("Native MON received for user %s: +%s MON", telegram_id, balance_increase)
+                else:
+                    logger.info("Verified token received for user %s: +%s %s", telegram_id, balance_increase, symbol)
+        
+        # Tokens not in the snapshot: notify for verified tokens with a balance
+        for symbol in new_symbols - _NATIVE_SYMBOLS:
+            token_data = current_tokens[symbol]
             if not token_data.get('verified'):
-                if is_new:
-                    print(f"  ⏭️ Skipping non-verified new token: {symbol}")
+                logger.debug("Skipping non-verified new token: %s", symbol)
                 continue
             
-            # For verified tokens: notify for NEW token OR balance increase
-            if is_new:
-                # New token
-                balance = token_data.get('balance', 0)
-                print(f"  ✅ New verified token qualifies: {symbol}, balance={balance}")
-                if balance > 0:
-                    # Try to find TX hash for new token received
-                    try:
-                        import requests
-                        from config import ALCHEMY_MONAD_URL
-                        
-                        payload = {
-                            "jsonrpc": "2.0",
-                            "id": 1,
-                            "method": "alchemy_getAssetTransfers",
-                            "params": [{
-                                "toAddress": wallet_address,
-                                "category": ["erc20"],
-                                "order": "desc",
-                                "maxCount": "0x5",
-                                "withMetadata": True
-                            }]
-                        }
-                        
-                        response = requests.post(ALCHEMY_MONAD_URL, json=payload, timeout=5)
-                        
-                        if response.ok:
-                            data = response.json()
-                            if 'result' in data:
-                                transfers = data['result'].get('transfers', [])
-                                token_address = token_data.get('address', '').lower()
-                                
-                                for tx in transfers:
-                                    tx_token = tx.get('rawContract', {}).get('address', '').lower()
-                                    if tx_token == token_address:
-                                        token_data['tx_hash'] = tx.get('hash')
-                                        print(f"  🔔 Found TX for new token: {tx.get('hash')}")
-                                        break
-                    except Exception as e:
-                        print(f"  ⚠️ Could not fetch TX for new token: {e}")
-                    
-                    new_tokens.append(token_data)
-                    print(f"🔔 New verified token detected for user {telegram_id}: {symbol} ({balance})")
-                else:
-                    print(f"  ⚠️ Skipped: balance is 0")
-            elif symbol in last_snapshot:
-                # Existing token - check if balance increased significantly
-                old_balance = float(last_snapshot[symbol].get('balance', 0))
-                new_balance = float(token_data.get('balance', 0))
-                # Minimum threshold: 0.0001 to avoid false positives from precision errors
-                if new_balance > old_balance + 0.0001:
-                    balance_increase = new_balance - old_balance
-                    token_data['balance_increase'] = balance_increase
-                    
-                    # Try to find the transaction hash for ERC20 token transfer
-                    print(f"🔍 Searching ERC20 TX for {symbol}: +{balance_increase}")
-                    try:
-                        import requests
-                        from config import ALCHEMY_MONAD_URL
-                        
-                        # Use Alchemy getAssetTransfers for ERC20 tokens
-                        payload = {
-                            "jsonrpc": "2.0",
-                            "id": 1,
-                            "method": "alchemy_getAssetTransfers",
-                            "params": [{
-                                "toAddress": wallet_address,
-                                "category": ["erc20"],  # ERC20 token transfers
-                                "order": "desc",
-                                "maxCount": "0xa",  # Last 10 transactions
-                                "withMetadata": True
-                            }]
-                        }
-                        
-                        response = requests.post(ALCHEMY_MONAD_URL, json=payload, timeout=5)
-                        
-                        if response.ok:
-                            data = response.json()
-                            if 'result' in data:
-                                transfers = data['result'].get('transfers', [])
-                                print(f"  📦 Got {len(transfers)} ERC20 transfers from Alchemy")
-                                
-                                # Find transaction matching token address and amount
-                                token_address = token_data.get('address', '').lower()
-                                print(f"  🔍 Looking for token: {token_address}, amount: {balance_increase}")
-                                
-                                for i, tx in enumerate(transfers):
-                                    tx_token = tx.get('rawContract', {}).get('address', '').lower()
-                                    tx_value = float(tx.get('value', 0))
-                                    tx_hash = tx.get('hash')
-                                    
-                                    print(f"  TX {i+1}: {tx_hash}")
-                                    print(f"    Token: {tx_token} (match: {tx_token == token_address})")
-                                    print(f"    Amount: {tx_value} (diff: {abs(tx_value - balance_increase)})")
-                                    
-                                    # Match by token address and amount
-                                    if tx_token == token_address and abs(tx_value - balance_increase) < 0.001:
-                                        token_data['tx_hash'] = tx_hash
-                                        print(f"  ✅ MATCH! Found TX via Alchemy: {tx_hash}")
-                                        break
-                                else:
-                                    print(f"  ❌ No matching TX found in {len(transfers)} transfers")
-                            else:
-                                print(f"⚠️ Alchemy ERC20 response missing result: {data}")
-                        else:
-                            print(f"⚠️ Alchemy ERC20 API failed: {response.status_code}")
-                    
-                    except Exception as e:
-                        print(f"⚠️ Could not fetch ERC20 TX hash: {e}")
-                        import traceback
-                        traceback.print_exc()
-                    
-                    new_tokens.append(token_data)
-                    print(f"🔔 Verified token received for user {telegram_id}: +{balance_increase} {symbol}")
+            balance = token_data.get('balance', 0)
+            logger.debug("Found new verified token: %s (balance: %s)", symbol, balance)
+            if balance > 0:
+                new_tokens.append(token_data)
+                logger.info("New verified token detected for user %s: %s (%s)", telegram_id, symbol, balance)
+            else:
+                logger.debug("Skipped %s: balance is 0", symbol)
         
         # Send notifications for new tokens
         if new_tokens:
-            await send_token_notification(bot, telegram_id, new_tokens)
+            await _attach_tx_hashes(wallet_address, new_tokens, shared)
+            await send_token_notification(bot, telegram_id, new_tokens, wallet_address)
         
         # Update snapshot with current tokens
-        db_manager.update_token_snapshot(telegram_id, current_tokens)
+        _save_snapshot(telegram_id, current_tokens)
+        _wallet_fingerprints[telegram_id] = fingerprint
         
     except Exception as e:
-        print(f"⚠️ Error checking tokens for user {user.telegram_id}: {e}")
+        logger.warning("Error checking tokens for user %s: %s", user.telegram_id, e)
+
+def _to_decimal(value) -> Decimal:
+    """Convert a balance (Decimal, number or string) to Decimal, 0 if unparsable"""
+    if isinstance(value, Decimal):
+        return value
+    try:
+        return Decimal(str(value))
+    except (InvalidOperation, ValueError):
+        return Decimal(0)
+
+def _save_snapshot(telegram_id: int, tokens: Dict[str, Dict]):
+    """
+    Store a user's current tokens as the last known snapshot
+    Updates the in-memory cache and, only if something changed, queues the user for the next database flush
+    """
+    snapshot = {
+        symbol: {
+            'address': data.get('address', ''),
+            'balance': _to_decimal(data.get('balance', 0)),
+            'name': data.get('name', symbol),
+            'verified': bool(data.get('verified'))
+        }
+        for symbol, data in tokens.items()
+    }
+    if _snapshot_cache.get(telegram_id) == snapshot:
+        return
+    
+    _snapshot_cache[telegram_id] = snapshot
+    _dirty_snapshots[telegram_id] = tokens
+
+async def _flush_snapshots():
+    """Write all changed snapshots to the database in one transaction (off the event loop)"""
+    if not _dirty_snapshots:
+        return
+    
+    dirty = dict(_dirty_snapshots)
+    _dirty_snapshots.clear()
+    try:
+        await asyncio.to_thread(db_manager.bulk_update_token_snapshots, dirty)
+    except Exception as e:
+        logger.warning("Failed to save token snapshots: %s", e)
+        # Keep them for the next flush unless a newer snapshot was queued meanwhile
+        for telegram_id, tokens in dirty.items():
+            _dirty_snapshots.setdefault(telegram_id, tokens)
+
+async def _erc20_transfers_from_logs(wallet_address: str, tokens: List[Dict]) -> List[Dict]:
+    """
+    Get the latest incoming ERC20 transfers from Transfer event logs (fallback when Alchemy fails)
+    One eth_getLogs call over the last TX_LOOKBACK_BLOCKS blocks, filtered by recipient topic
+    
+    Args:
+        wallet_address: Wallet address
+        tokens: Received token dicts, their decimals are used to convert the amounts
+        
+    Returns:
+        Transfers shaped like Alchemy getAssetTransfers results, most recent first
+    """
+    try:
+        latest_block = await blockchain_manager.aw3.eth.block_number
+        logs = await blockchain_manager.aw3.eth.get_logs({
+            'fromBlock': max(latest_block - TX_LOOKBACK_BLOCKS, 0),
+            'toBlock': latest_block,
+            'topics': [TRANSFER_TOPIC, None, _wallet_topic(wallet_address)]
+        })
+    except Exception as e:
+        logger.warning("Transfer logs lookup failed: %s", e)
+        return []
+    
+    decimals = {token.get('address', '').lower(): token.get('decimals', 18) for token in tokens}
+    
+    transfers = []
+    for log in reversed(logs[-10:]):
+        token_address = log['address'].lower()
+        transfers.append({
+            'hash': log['transactionHash'].hex(),
+            'rawContract': {'address': token_address},
+            'value': int.from_bytes(log['data'], 'big') / 10 ** decimals.get(token_address, 18)
+        })
+    return transfers
+
+async def _attach_tx_hashes(wallet_address: str, new_tokens: List[Dict], shared: bool = False):
+    """
+    Find the transaction of each received token and store it as token['tx_hash']
+    Native and ERC20 transfers are looked up together in one Alchemy batch request
+    
+    Args:
+        wallet_address: Wallet address
+        new_tokens: Received token dicts (with 'balance_increase' unless the token is new)
+        shared: Reuse a transfer lookup already made for this wallet in this poll cycle
+    """
+    is_native = [token.get('symbol') in _NATIVE_SYMBOLS for token in new_tokens]
+    categories = []
+    if any(is_native):
+        categories.append("external")  # Native MON transfers
+    if not all(is_native):
+        categories.append("erc20")  # ERC20 token transfers
+    
+    try:
+        if shared:
+            transfers = dict(await _cycle_lookup(
+                ('transfers', wallet_address.lower(), *categories),
+                lambda: _fetch_recent_transfers(wallet_address, categories)
+            ))
+        else:
+            transfers = await _fetch_recent_transfers(wallet_address, categories)
+    except Exception as e:
+        logger.warning("Could not fetch TX hashes: %s", e)
+        transfers = {category: [] for category in categories}
+    
+    # Without Alchemy, ERC20 transfers can still be found with one eth_getLogs call
+    if "erc20" in transfers and not transfers["erc20"]:
+        transfers["erc20"] = await _erc20_transfers_from_logs(wallet_address, new_tokens)
+    
+    # ERC20 transfers grouped by token contract once: (hash, amount), most recent first
+    erc20_by_token: Dict[str, List[tuple]] = {}
+    for tx in transfers.get("erc20", ()):
+        tx_token = tx.get('rawContract', {}).get('address', '').lower()
+        erc20_by_token.setdefault(tx_token, []).append((tx.get('hash'), float(tx.get('value', 0))))
+    
+    for token_data, native in zip(new_tokens, is_native):
+        balance_increase = token_data.get('balance_increase')
+        
+        if native:
+            balance_increase = float(balance_increase)
+            
+            # Find transaction matching the balance increase
+            for tx in transfers["external"]:
+                tx_value = float(tx.get('value', 0))
+                # Match with tolerance (0.001 MON)
+                if abs(tx_value - balance_increase) < 0.001:
+                    token_data['tx_hash'] = tx.get('hash')
+                    logger.info("Found TX via Alchemy: %s", tx.get('hash'))
+                    break
+            continue
+        
+        token_address = token_data.get('address', '').lower()
+        token_transfers = erc20_by_token.get(token_address, [])
+        
+        if balance_increase is None:
+            # New token: latest transfer of this token
+            if token_transfers:
+                token_data['tx_hash'] = token_transfers[0][0]
+                logger.info("Found TX for new token: %s", token_transfers[0][0])
+            continue
+        
+        balance_increase = float(balance_increase)
+        
+        # Find transaction matching token address and amount
+        logger.debug("Looking for token %s, amount %s in %d transfers", token_address, balance_increase, len(token_transfers))
+        
+        for tx_hash, tx_value in token_transfers:
+            if abs(tx_value - balance_increase) < 0.001:
+                token_data['tx_hash'] = tx_hash
+                logger.info("Found TX via Alchemy: %s", tx_hash)
+                break
+        else:
+            logger.debug("No matching TX found for %s", token_address)
+
+@lru_cache(maxsize=None)
+def _wallet_topic(wallet_address: str) -> str:
+    """Pad a wallet address to the 32-byte topic form used in indexed event arguments (once per wallet)"""
+    return sys.intern('0x' + '0' * 24 + wallet_address[2:].lower())
+
+async def watch_transfer_logs(get_wallet_topics: Callable[[], FrozenSet[str]], on_transfer: Callable[[str], None]):
+    """
+    Subscribe to ERC20 Transfer logs sent to the monitored wallets over WebSocket
+    
+    Calls on_transfer(wallet_topic) for each log, so a wallet is checked right after it
+    receives a token instead of at the next poll. Resubscribes when the wallet set changes
+    and reconnects after errors.
+    
+    Args:
+        get_wallet_topics: Returns the padded topics of all monitored wallets (a new object only
+            when the set changed, so checking for a change is an identity test)
+        on_transfer: Called with the padded topic of the receiving wallet
+    """
+    while True:
+        wallet_topics = get_wallet_topics()
+        if not wallet_topics:
+            await asyncio.sleep(30)
+            continue
+        
+        try:
+            async with websockets.connect(MONAD_TESTNET_WSS_URL, ping_interval=20) as ws:
+                await ws.send(json.dumps({
+                    "jsonrpc": "2.0",
+                    "id": 1,
+                    "method": "eth_subscribe",
+                    "params": ["logs", {"topics": [TRANSFER_TOPIC, None, sorted(wallet_topics)]}]
+                }))
+                print(f"📡 Subscribed to token transfers of {len(wallet_topics)} wallets")
+                
+                while get_wallet_topics() is wallet_topics:
+                    try:
+                        message = orjson.loads(await asyncio.wait_for(ws.recv(), timeout=30))
+                    except asyncio.TimeoutError:
+                        continue
+                    
+                    log = message.get('params', {}).get('result')
+                    if isinstance(log, dict) and len(log.get('topics', [])) > 2:
+                        # Node topics are lowercase hex, the same form as the precomputed wallet topics
+                        on_transfer(log['topics'][2])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print(f"⚠️ Transfer subscription error: {e}")
+            await asyncio.sleep(5)
+
+def _log_watcher_exit(task: asyncio.Task):
+    """Log why the transfer log watcher stopped (it only returns on cancellation or a bug)"""
+    if not task.cancelled() and task.exception() is not None:
+        logger.error("Transfer log watcher stopped", exc_info=task.exception())
 
 async def monitor_tokens(bot: Bot):
     """
     Background task to monitor all users' wallets for new tokens
-    Runs every 30 seconds (faster notifications)
+    Runs every 30 seconds (faster notifications), and right after a token transfer
+    when MONAD_TESTNET_WSS_URL is set
     
     Args:
         bot: Telegram Bot instance
     """
     print("🔔 Notification monitor started (30s interval)")
     
-    while True:
+    semaphore = asyncio.Semaphore(MONITOR_CONCURRENCY)
+    
+    async def check_bounded(user, full_scan: bool = False, shared: bool = False):
+        if user.telegram_id in _checks_in_progress:
+            return
+        _checks_in_progress.add(user.telegram_id)
         try:
-            # Get all users with notifications enabled
-            users = db_manager.get_users_with_notifications()
-            
-            if not users:
-                print("⏸️ No users with notifications enabled")
-            else:
-                print(f"🔍 Checking {len(users)} users for new tokens...")
+            async with semaphore:
+                await check_user_for_new_tokens(bot, user, user.wallet_address, full_scan, shared)
+        finally:
+            _checks_in_progress.discard(user.telegram_id)
+    
+    # Padded wallet topic -> users, rebuilt whenever the user list is reloaded
+    users_by_topic: Dict[str, List] = {}
+    wallet_topics: FrozenSet[str] = frozenset()
+    
+    pushed_checks: Set[asyncio.Task] = set()
+    
+    def on_transfer(wallet_topic: str):
+        for user in users_by_topic.get(wallet_topic, ()):
+            task = asyncio.create_task(check_bounded(user, full_scan=True))
+            pushed_checks.add(task)
+            task.add_done_callback(pushed_checks.discard)
+    
+    try:
+        snapshots = await asyncio.to_thread(db_manager.get_all_token_snapshots)
+        # Balances are stored as strings, parse them once here instead of on every comparison
+        for snapshot in snapshots.values():
+            for data in snapshot.values():
+                data['balance'] = _to_decimal(data['balance'])
+        _snapshot_cache.update(snapshots)
+    except Exception as e:
+        print(f"⚠️ Could not load token snapshots: {e}")
+    
+    cycle = 0
+    
+    watcher = None
+    if MONAD_TESTNET_WSS_URL:
+        watcher = asyncio.create_task(watch_transfer_logs(lambda: wallet_topics, on_transfer))
+        watcher.add_done_callback(_log_watcher_exit)
+    
+    try:
+        while True:
+            try:
+                full_scan = cycle % FULL_SCAN_CYCLES == 0
+                _cycle_lookups.clear()
                 
+                # Get all users with notifications enabled (every cycle, so toggles apply on the next poll)
+                users = await asyncio.to_thread(db_manager.get_users_with_notifications)
+                users_by_topic = {}
                 for user in users:
-                    # Check each user
-                    await check_user_for_new_tokens(bot, user, user.wallet_address)
+                    users_by_topic.setdefault(_wallet_topic(user.wallet_address), []).append(user)
+                if users_by_topic.keys() != wallet_topics:
+                    wallet_topics = frozenset(users_by_topic)
+                cycle += 1
+                
+                if not users:
+                    print("⏸️ No users with notifications enabled")
+                else:
+                    print(f"🔍 Checking {len(users)} users for new tokens...")
                     
-                    # Small delay between users to avoid rate limits
-                    await asyncio.sleep(1)
+                    # Check users concurrently, the semaphore and connection limit cap the request rate
+                    await asyncio.gather(
+                        *(check_bounded(user, full_scan, shared=True) for user in users),
+                        return_exceptions=True
+                    )
+                
+                # One database write for every snapshot that changed this cycle
+                await _flush_snapshots()
+                
+            except Exception as e:
+                print(f"⚠️ Monitor error: {e}")
             
-        except Exception as e:
-            print(f"⚠️ Monitor error: {e}")
-        
-        # Wait 30 seconds before next check (faster!)
-        await asyncio.sleep(30)
+            # Wait 30 seconds before next check (faster!)
+            await asyncio.sleep(30)
+    finally:
+        if watcher is not None:
+            watcher.cancel()
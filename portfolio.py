@@ -2,29 +2,62 @@
 Portfolio Module - Enhanced wallet visualization with ASCII charts
 Provides portfolio overview with allocation bars and USD estimates
 """
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from decimal import Decimal
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+import time
 from blockchain import blockchain_manager
 from database import db_manager
 
+logger = logging.getLogger(__name__)
+
 # Price cache to avoid repeated API calls (cache for 5 minutes)
-_price_cache = {}
-_cache_expiry = {}
+_price_cache: Dict[str, Tuple[float, float]] = {}  # token address -> (price, time.monotonic() deadline)
 CACHE_DURATION_SECONDS = 300  # 5 minutes
 
+# MON price is the same for every user - one (price, monotonic expiry) slot
+_mon_price_cached: Optional[Tuple[float, float]] = None
+
+# MarkdownV2 special characters, escaped in a single pass by escape_markdown()
+_MD2_SPECIALS = frozenset('_*[]()~`>#+-=|{}.!')
+_MD2_TRANS = str.maketrans({c: '\\' + c for c in _MD2_SPECIALS})
+
+# Liquid staking / wrapped MON tokens - priced as 1 MON
+_MON_DERIVATIVES = frozenset({'gMON', 'aprMON', 'shMON', 'sMON', 'WMON', 'stMON', 'FMON', 'swMON'})
+_LP_MARKERS = ('LP', 'POOL')
+
+# Precomputed bars for the widths used by render_portfolio, indexed by fill
+_BAR_TABLES = {
+    width: tuple("█" * fill + "░" * (width - fill) for fill in range(width + 1))
+    for width in (14, 16)
+}
+
+def _is_lp_symbol(symbol: str) -> bool:
+    """Liquidity pool tokens have unreliable prices"""
+    sym_upper = symbol.upper()
+    return any(marker in sym_upper for marker in _LP_MARKERS)
+
+# Static MarkdownV2 blocks of render_portfolio (already escaped, joined with "\n")
+_PORTFOLIO_HEADER = "*📊 Portfolio Overview*\n"
+_NO_TOKENS_TEXT = (
+    "_No ERC\\-20 tokens yet_\n"
+    "\n"
+    "💡 *Tip:* Use 🚀 Buy Token to add tokens to your portfolio"
+)
+_PORTFOLIO_FOOTER = "━" * 16 + "\n💡 *Legend:* █ \\= allocation \\| ░ \\= remaining"
+
 def get_cached_price(token_address: str) -> Optional[float]:
     """Get cached price if available and not expired"""
-    if token_address in _price_cache:
-        if token_address in _cache_expiry:
-            if datetime.now() < _cache_expiry[token_address]:
-                return _price_cache[token_address]
+    entry = _price_cache.get(token_address)
+    if entry is not None and time.monotonic() < entry[1]:
+        return entry[0]
     return None
 
 def cache_price(token_address: str, price: float):
-    """Cache a price with expiry time"""
-    _price_cache[token_address] = price
-    _cache_expiry[token_address] = datetime.now() + timedelta(seconds=CACHE_DURATION_SECONDS)
+    """Cache a price with expiry time (monotonic clock)"""
+    _price_cache[token_address] = (price, time.monotonic() + CACHE_DURATION_SECONDS)
 
 def ascii_bar(pct: float, width: int = 16) -> str:
     """
@@ -40,14 +73,27 @@ def ascii_bar(pct: float, width: int = 16) -> str:
     Example:
         ascii_bar(0.75, 16) -> "████████████░░░░"
     """
-    if pct < 0:
-        pct = 0
-    if pct > 1:
-        pct = 1
-    
     fill = int(pct * width + 0.5)
+    fill = 0 if fill < 0 else width if fill > width else fill
+    
+    table = _BAR_TABLES.get(width)
+    if table is not None:
+        return table[fill]
     return "█" * fill + "░" * (width - fill)
 
+@lru_cache(maxsize=4096)
+def _escape_markdown_str(text: str) -> str:
+    """Escape a string for MarkdownV2 (memoized - symbols and labels repeat on every render)"""
+    # Fast path: most symbols and numbers have nothing to escape
+    if _MD2_SPECIALS.isdisjoint(text):
+        return text
+    
+    return text.translate(_MD2_TRANS)
+
+def _escape_decimal(s: str) -> str:
+    """Escape a formatted number for MarkdownV2 - only '.' and '-' can occur"""
+    return s.replace('.', '\\.').replace('-', '\\-')
+
 def escape_markdown(text: str) -> str:
     """
     Escape special characters for MarkdownV2
@@ -55,36 +101,44 @@ def escape_markdown(text: str) -> str:
     MarkdownV2 special chars that MUST be escaped outside code blocks:
     _ * [ ] ( ) ~ ` > # + - = | { } . !
     """
-    # Convert to string first if not already
-    text = str(text)
-    
-    # Escape all special MarkdownV2 characters
-    # Order matters for some chars, but for MarkdownV2 we escape each individually
-    replacements = {
-        '_': '\\_',
-        '*': '\\*',
-        '[': '\\[',
-        ']': '\\]',
-        '(': '\\(',
-        ')': '\\)',
-        '~': '\\~',  # Important: strikethrough marker
-        '`': '\\`',
-        '>': '\\>',
-        '#': '\\#',
-        '+': '\\+',
-        '-': '\\-',
-        '=': '\\=',
-        '|': '\\|',
-        '{': '\\{',
-        '}': '\\}',
-        '.': '\\.',
-        '!': '\\!'
-    }
+    return _escape_markdown_str(str(text))
+
+def _get_mon_price_usd() -> float:
+    """Get MON price in USD (cached, falls back to $1 when unavailable)"""
+    global _mon_price_cached
     
-    for char, escaped in replacements.items():
-        text = text.replace(char, escaped)
+    # Check cache first
+    if _mon_price_cached and time.monotonic() < _mon_price_cached[1]:
+        return _mon_price_cached[0]
     
-    return text
+    mon_price_usd = None
+    try:
+        # Try to get WMON price (wrapped MON)
+        wmon_address = '0x760afe86e5de5fa0ee542fc7b7b713e1c5425701'  # WMON address
+        
+        # Fetch from API
+        mon_price = blockchain_manager.get_token_price_from_nodejs(wmon_address)
+        if mon_price and mon_price > 0 and mon_price < 100:  # Sanity check
+            mon_price_usd = float(mon_price)
+            logger.debug("MON price fetched: $%.6f", mon_price_usd)
+        else:
+            # Fallback to on-chain
+            onchain_price = blockchain_manager.get_token_price_onchain(wmon_address)
+            if onchain_price and onchain_price > 0:
+                mon_price_usd = float(onchain_price)
+                logger.debug("MON price (on-chain): $%.6f", mon_price_usd)
+        
+        if mon_price_usd:
+            _mon_price_cached = (mon_price_usd, time.monotonic() + CACHE_DURATION_SECONDS)
+    except Exception as e:
+        logger.warning("Failed to fetch MON price: %s", e)
+    
+    # Fallback: if still no MON price, use $1
+    if not mon_price_usd or mon_price_usd <= 0:
+        mon_price_usd = 1.0
+        logger.warning("Using fallback MON price: $1.00")
+    
+    return mon_price_usd
 
 def get_wallet_overview(user_id: int, wallet_address: str, fetch_prices_for_top: int = 25) -> Dict:
     """
@@ -100,15 +154,34 @@ def get_wallet_overview(user_id: int, wallet_address: str, fetch_prices_for_top:
             - tokens: List of token dicts with balance, symbol, name, address, decimals
             - total_positions: Total number of positions (including native)
     """
-    # Get native balance
-    native_balance = blockchain_manager.get_native_balance(wallet_address)
-    
-    # Get all tokens using BlockVision API
-    all_tokens = blockchain_manager.get_wallet_all_tokens(wallet_address)
+    # Empty wallet shortcut: no token history and no gas -> skip the token/price APIs
+    has_token_history = db_manager.get_user_token_count(user_id) > 0
+    native_balance = None
+    if not has_token_history:
+        native_balance = blockchain_manager.get_native_balance(wallet_address)
+        if native_balance == 0:
+            return {
+                'native': Decimal('0'),
+                'tokens': [],
+                'total_positions': 1
+            }
+    
+    # Native balance, token list and MON price are independent network calls - run them concurrently
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        if native_balance is None:
+            native_future = executor.submit(blockchain_manager.get_native_balance, wallet_address)
+        tokens_future = executor.submit(blockchain_manager.get_wallet_all_tokens, wallet_address)
+        # Fetch MON price ONCE and apply to all derivatives
+        mon_price_future = executor.submit(_get_mon_price_usd)
+        
+        if native_balance is None:
+            native_balance = native_future.result()
+        all_tokens = tokens_future.result()
+        mon_price_usd = mon_price_future.result()
     
     # Fallback: Check token history if BlockVision didn't return enough
     non_native_count = sum(1 for s in all_tokens.keys() if s not in ['MON', 'MONAD'])
-    if non_native_count == 0:
+    if non_native_count == 0 and has_token_history:
         user_token_addresses = db_manager.get_user_tokens(user_id)
         
         if user_token_addresses:
@@ -130,6 +203,7 @@ def get_wallet_overview(user_id: int, wallet_address: str, fetch_prices_for_top:
                 'symbol': symbol,
                 'name': token_data.get('name', symbol),
                 'balance': token_data['balance'],
+                '_bal_float': float(token_data['balance']),  # hot sort / allocation key
                 'decimals': token_data.get('decimals', 18),
                 'address': token_data.get('address', ''),
                 'verified': token_data.get('verified', False),
@@ -138,123 +212,95 @@ def get_wallet_overview(user_id: int, wallet_address: str, fetch_prices_for_top:
             })
     
     # Sort: VERIFIED tokens first (for price priority), then by balance
-    tokens.sort(key=lambda x: (not x.get('verified', False), -float(x['balance'])))
-    
-    # Fetch MON price ONCE and apply to all derivatives
-    mon_price_usd = None
-    try:
-        # Try to get WMON price (wrapped MON)
-        wmon_address = '0x760afe86e5de5fa0ee542fc7b7b713e1c5425701'  # WMON address
-        
-        # Check cache first
-        mon_price_usd = get_cached_price('MON')
-        if mon_price_usd:
-            print(f"✅ MON price from cache: ${mon_price_usd:.6f}")
-        else:
-            # Fetch from API
-            mon_price = blockchain_manager.get_token_price_from_nodejs(wmon_address)
-            if mon_price and mon_price > 0 and mon_price < 100:  # Sanity check
-                mon_price_usd = float(mon_price)
-                cache_price('MON', mon_price_usd)
-                print(f"✅ MON price fetched: ${mon_price_usd:.6f}")
-            else:
-                # Fallback to on-chain
-                onchain_price = blockchain_manager.get_token_price_onchain(wmon_address)
-                if onchain_price and onchain_price > 0:
-                    mon_price_usd = float(onchain_price)
-                    cache_price('MON', mon_price_usd)
-                    print(f"✅ MON price (on-chain): ${mon_price_usd:.6f}")
-    except Exception as e:
-        print(f"⚠️ Failed to fetch MON price: {e}")
-    
-    # Fallback: if still no MON price, use $1
-    if not mon_price_usd or mon_price_usd <= 0:
-        mon_price_usd = 1.0
-        print(f"⚠️ Using fallback MON price: $1.00")
+    tokens.sort(key=lambda x: (not x.get('verified', False), -x['_bal_float']))
     
     # Fetch prices for top N tokens (prioritize verified tokens)
     if fetch_prices_for_top > 0:
-        # Prioritize verified tokens for pricing
-        verified_tokens = [t for t in tokens if t.get('verified')]
-        unverified_tokens = [t for t in tokens if not t.get('verified')]
+        # Verified tokens first, then top unverified - tokens is already sorted that way
+        tokens_to_price = tokens[:fetch_prices_for_top]
         
-        # Fetch prices for verified tokens first, then top unverified
-        tokens_to_price = verified_tokens[:fetch_prices_for_top]
-        remaining_slots = fetch_prices_for_top - len(tokens_to_price)
-        if remaining_slots > 0:
-            tokens_to_price.extend(unverified_tokens[:remaining_slots])
+        logger.debug("Fetching prices for %d tokens", len(tokens_to_price))
         
-        print(f"🔍 Fetching prices for {len(tokens_to_price)} tokens ({len([t for t in tokens_to_price if t.get('verified')])} verified)...")
+        # Fetch all uncached prices in one batch (one call per wallet, not per token)
+        addresses_to_fetch = [
+            t['address'] for t in tokens_to_price
+            if t['address']
+            and t['symbol'] not in _MON_DERIVATIVES
+            and not _is_lp_symbol(t['symbol'])
+            and not get_cached_price(t['address'])
+        ]
+        fetched_prices = {}
+        if addresses_to_fetch:
+            try:
+                fetched_prices = blockchain_manager.get_token_prices(addresses_to_fetch)
+            except Exception as e:
+                logger.warning("Batch price fetch failed: %s", e)
+        
+        # Re-quote suspicious API prices on the DEX in one multicall as well
+        suspicious_addresses = [a for a, p in fetched_prices.items() if p and p > 1000]
+        onchain_prices = {}
+        if suspicious_addresses:
+            try:
+                onchain_prices = blockchain_manager.get_token_prices_onchain(suspicious_addresses)
+            except Exception as e:
+                logger.warning("Batch on-chain price fetch failed: %s", e)
         
         for token in tokens_to_price:
             token_address = token['address']
-            balance = token['balance']
+            balance = token['_bal_float']
             symbol = token['symbol']
             
             # Skip LP tokens (liquidity pool tokens have unreliable prices)
-            if 'LP' in symbol.upper() or '-LP' in symbol or 'POOL' in symbol.upper():
-                print(f"⚠️ Skipping LP token: {symbol} (LP tokens have unreliable prices)")
+            if _is_lp_symbol(symbol):
+                logger.debug("Skipping LP token: %s (LP tokens have unreliable prices)", symbol)
                 continue
             
             if token_address:
                 try:
                     # Special case: MON derivatives = 1 MON (use real MON price)
-                    MON_DERIVATIVES = ['gMON', 'aprMON', 'shMON', 'sMON', 'WMON', 'stMON', 'FMON', 'swMON']
-                    if symbol in MON_DERIVATIVES:
+                    if symbol in _MON_DERIVATIVES:
                         price = mon_price_usd  # Use real MON price
                         token['price_usd'] = float(price)
-                        token['value_usd'] = float(balance) * token['price_usd']
-                        print(f"✅ {symbol}: ${price:.6f} (MON derivative) × {float(balance):.2f} = ${token['value_usd']:.2f}")
+                        token['value_usd'] = balance * token['price_usd']
+                        logger.debug("%s: $%.6f (MON derivative) x %.2f = $%.2f", symbol, price, balance, token['value_usd'])
                         continue
                     
                     # Check cache first
                     cached_price = get_cached_price(token_address)
                     if cached_price:
                         token['price_usd'] = cached_price
-                        token['value_usd'] = float(balance) * cached_price
-                        print(f"✅ {symbol}: ${cached_price:.6f} (cached) × {float(balance):.2f} = ${token['value_usd']:.2f}")
+                        token['value_usd'] = balance * cached_price
+                        logger.debug("%s: $%.6f (cached) x %.2f = $%.2f", symbol, cached_price, balance, token['value_usd'])
                         continue
                     
-                    price = blockchain_manager.get_token_price_from_nodejs(token_address)
+                    price = fetched_prices.get(token_address)
                     if price and price > 0:
                         # Sanity check: If price seems too high, try on-chain fallback
                         if price > 1000:  # $1000+ per token is suspicious for testnet
-                            print(f"⚠️ Suspicious price for {symbol}: ${price:.2f} - trying on-chain DEX...")
+                            logger.debug("Suspicious price for %s: $%.2f - trying on-chain DEX", symbol, price)
                             
-                            # Try on-chain price as fallback
-                            try:
-                                onchain_price = blockchain_manager.get_token_price_onchain(token_address)
-                                if onchain_price and onchain_price > 0 and onchain_price < 1000:
-                                    price = onchain_price
-                                    print(f"✅ On-chain price for {symbol}: ${price:.6f}")
-                                else:
-                                    print(f"⚠️ On-chain price also suspicious or unavailable, skipping {symbol}")
-                                    continue
-                            except Exception as e:
-                                print(f"⚠️ On-chain price fetch failed for {symbol}: {e}")
+                            # Use the batched on-chain price as fallback
+                            onchain_price = onchain_prices.get(token_address)
+                            if onchain_price and onchain_price > 0 and onchain_price < 1000:
+                                price = onchain_price
+                                logger.debug("On-chain price for %s: $%.6f", symbol, price)
+                            else:
+                                logger.debug("On-chain price also suspicious or unavailable, skipping %s", symbol)
                                 continue
                         
                         token['price_usd'] = float(price)
-                        token['value_usd'] = float(balance) * token['price_usd']
+                        token['value_usd'] = balance * token['price_usd']
                         
                         # Cache the price
                         cache_price(token_address, float(price))
                         
-                        print(f"✅ {symbol}: ${token['price_usd']:.6f} × {float(balance):.2f} = ${token['value_usd']:.2f}")
+                        logger.debug("%s: $%.6f x %.2f = $%.2f", symbol, token['price_usd'], balance, token['value_usd'])
                 except Exception as e:
-                    print(f"⚠️ Price fetch failed for {symbol}: {e}")
+                    logger.warning("Price fetch failed for %s: %s", symbol, e)
         
-        # Re-sort by USD value if we have prices
-        tokens_with_value = [t for t in tokens if t.get('value_usd')]
-        tokens_without_value = [t for t in tokens if not t.get('value_usd')]
-        
-        if tokens_with_value:
-            tokens_with_value.sort(key=lambda x: x['value_usd'], reverse=True)
-            tokens = tokens_with_value + tokens_without_value  # Valued tokens first
-    
-    # Sort by balance (descending) - but this is RAW balance
-    # For better UX, we should normalize first but that requires more data
-    tokens.sort(key=lambda x: x['balance'], reverse=True)
+    # Final order: priced tokens by USD value (descending). The sort is stable, so
+    # unpriced tokens and ties keep the verified-first / balance order from above
+    tokens.sort(key=lambda x: -(x['value_usd'] or 0))
     
     return {
         'native': native_balance,
@@ -292,7 +338,7 @@ def estimate_token_price(token_address: str) -> Optional[float]:
         
         return None
     except Exception as e:
-        print(f"⚠️ Price estimation failed for {token_address}: {e}")
+        logger.warning("Price estimation failed for %s: %s", token_address, e)
         return None
 
 def render_portfolio(overview: Dict, include_prices: bool = True, max_tokens: int = 25) -> str:
@@ -316,12 +362,10 @@ def render_portfolio(overview: Dict, include_prices: bool = True, max_tokens: in
     hidden_count = len(tokens) - len(tokens_to_display) if len(tokens) > max_tokens else 0
     
     # Build message
-    lines = []
-    lines.append("*📊 Portfolio Overview*")
-    lines.append("")
+    lines = [_PORTFOLIO_HEADER]
     
     # Summary
-    lines.append(f"*Holdings:* {escape_markdown(str(total_positions))} positions")
+    lines.append(f"*Holdings:* {total_positions} positions")
     
     # Format native balance
     if native < Decimal('0.0001'):
@@ -331,50 +375,48 @@ def render_portfolio(overview: Dict, include_prices: bool = True, max_tokens: in
     else:
         native_str = f"{native:.4f}"
     
-    lines.append(f"*Native:* `{escape_markdown(native_str)} MONAD`")
+    lines.append(f"*Native:* `{_escape_decimal(native_str)} MONAD`")
     lines.append("")
     
     # If no tokens, show message
     if not tokens_to_display:
-        lines.append("_No ERC\\-20 tokens yet_")
-        lines.append("")
-        lines.append("💡 *Tip:* Use 🚀 Buy Token to add tokens to your portfolio")
+        lines.append(_NO_TOKENS_TEXT)
         return "\n".join(lines)
     
     # Calculate allocation based on USD VALUE (not quantity!)
     # This gives accurate portfolio representation
     
-    # Separate tokens with prices vs without
-    tokens_with_price = [t for t in tokens_to_display if t.get('value_usd')]
-    tokens_without_price = [t for t in tokens_to_display if not t.get('value_usd')]
-    
-    # Calculate total USD value
-    total_value_usd = sum(t.get('value_usd', 0) for t in tokens_with_price)
+    # Tokens with prices and their total USD value, in one pass
+    tokens_with_price = []
+    total_value_usd = 0
+    for t in tokens_to_display:
+        if t.get('value_usd'):
+            tokens_with_price.append(t)
+            total_value_usd += t['value_usd']
     
     # Determine if we can use price-based allocation
     use_price_allocation = len(tokens_with_price) >= 3 and total_value_usd > 0
     
     if use_price_allocation:
         # PRICE-BASED ALLOCATION (Accurate!)
-        print(f"✅ Using price-based allocation (${total_value_usd:.2f} total)")
+        logger.debug("Using price-based allocation ($%.2f total)", total_value_usd)
         tokens_for_calc = tokens_with_price
         outlier_tokens = []  # No outlier detection needed with prices
-        allocation_mode = "value"
     else:
         # QUANTITY-BASED FALLBACK (when prices unavailable)
-        print(f"⚠️ Using quantity-based allocation (prices unavailable)")
+        logger.debug("Using quantity-based allocation (prices unavailable)")
         
         # Use outlier detection for quantity-based
         if len(tokens_to_display) >= 4:
-            sorted_tokens = sorted(tokens_to_display, key=lambda x: float(x['balance']), reverse=True)
-            reference_balance = float(sorted_tokens[3]['balance'])
+            sorted_tokens = sorted(tokens_to_display, key=lambda x: x['_bal_float'], reverse=True)
+            reference_balance = sorted_tokens[3]['_bal_float']
             outlier_threshold = reference_balance * 10
             
             filtered_tokens = []
             outlier_tokens = []
             
             for t in tokens_to_display:
-                if float(t['balance']) > outlier_threshold:
+                if t['_bal_float'] > outlier_threshold:
                     outlier_tokens.append(t)
                 else:
                     filtered_tokens.append(t)
@@ -387,14 +429,12 @@ def render_portfolio(overview: Dict, include_prices: bool = True, max_tokens: in
         else:
             tokens_for_calc = tokens_to_display
             outlier_tokens = []
-        
-        allocation_mode = "quantity"
     
     # Show allocation
     lines.append("*📈 Token Allocation:*")
     
     if use_price_allocation:
-        lines.append(f"_\\(By USD value: ${escape_markdown(f'{total_value_usd:.2f}')} total\\)_")
+        lines.append(f"_\\(By USD value: ${_escape_decimal(f'{total_value_usd:.2f}')} total\\)_")
     else:
         lines.append("_\\(By quantity \\- prices unavailable\\)_")
     
@@ -412,57 +452,53 @@ def render_portfolio(overview: Dict, include_prices: bool = True, max_tokens: in
     #         if token['address']:
     #             token['price_usd'] = estimate_token_price(token['address'])
     
+    # Allocation percentages for all rows at once (outliers and unpriced tokens get 0)
+    outlier_ids = {id(t) for t in outlier_tokens}
+    if use_price_allocation:
+        # PRICE-BASED: percentage of USD value
+        inv_total = 1.0 / total_value_usd
+        pcts = [(t.get('value_usd') or 0) * inv_total for t in tokens_to_display]
+    else:
+        # QUANTITY-BASED: percentage of token count (total is loop-invariant)
+        total_count = sum(t['_bal_float'] for t in tokens_for_calc)
+        inv_total = 1.0 / total_count if total_count > 0 else 0.0
+        pcts = [
+            0 if id(t) in outlier_ids else t['_bal_float'] * inv_total
+            for t in tokens_to_display
+        ]
+    
     # Display each token with bar
-    for token in tokens_to_display:
+    for token, pct in zip(tokens_to_display, pcts):
         symbol = token['symbol']
         balance = token['balance']
         value_usd = token.get('value_usd')
-        price_usd = token.get('price_usd')
         
         # Check if this token is in calculation set
-        is_outlier = token in outlier_tokens
-        
-        # Calculate percentage based on allocation mode
-        if use_price_allocation and value_usd and total_value_usd > 0:
-            # PRICE-BASED: percentage of USD value
-            pct = value_usd / total_value_usd
-        elif not is_outlier and allocation_mode == "quantity":
-            # QUANTITY-BASED: percentage of token count
-            total_count = sum(float(t['balance']) for t in tokens_for_calc)
-            pct = float(balance / total_count) if total_count > 0 else 0
-        else:
-            pct = 0
-        
-        # Format balance
-        if balance < Decimal('0.0001'):
-            balance_str = f"{balance:.8f}"
-        elif balance < Decimal('1'):
-            balance_str = f"{balance:.6f}"
-        else:
-            balance_str = f"{balance:.4f}"
+        is_outlier = id(token) in outlier_ids
         
         # Create ASCII bar
         bar = ascii_bar(pct, width=14)
-        pct_str = f"{pct * 100:.1f}%"
-        
-        # Build line with value if available
-        line_parts = [
-            f"`{escape_markdown(symbol[:8].ljust(8))}`",
-            bar,
-            f"{escape_markdown(pct_str.rjust(6))}",
-        ]
+        sym_esc = escape_markdown(symbol[:8].ljust(8))
+        pct_esc = _escape_decimal(f"{pct * 100:.1f}%".rjust(6))
         
         # Show USD value if available, otherwise show balance
         if value_usd:
-            line_parts.append(f"\\(`${escape_markdown(f'{value_usd:.2f}')}`\\)")
+            line = f"`{sym_esc}` {bar} {pct_esc} \\(`${_escape_decimal(f'{value_usd:.2f}')}`\\)"
         else:
-            line_parts.append(f"\\(`{escape_markdown(balance_str)}`\\)")
+            # Format balance
+            if balance < Decimal('0.0001'):
+                balance_str = f"{balance:.8f}"
+            elif balance < Decimal('1'):
+                balance_str = f"{balance:.6f}"
+            else:
+                balance_str = f"{balance:.4f}"
+            line = f"`{sym_esc}` {bar} {pct_esc} \\(`{_escape_decimal(balance_str)}`\\)"
         
         # Add outlier label if needed
         if is_outlier:
-            line_parts.append("_\\*outlier_")
+            line += " _\\*outlier_"
         
-        lines.append(" ".join(line_parts))
+        lines.append(line)
     
     lines.append("")
     
@@ -472,8 +508,7 @@ def render_portfolio(overview: Dict, include_prices: bool = True, max_tokens: in
         lines.append("")
     
     # Footer
-    lines.append("━━━━━━━━━━━━━━━━")
-    lines.append("💡 *Legend:* █ \\= allocation \\| ░ \\= remaining")
+    lines.append(_PORTFOLIO_FOOTER)
     
     return "\n".join(lines)
 
@@ -9,7 +9,10 @@
  * - Works for Monad Testnet
  * 
  * Usage:
- *   node getTokensAlchemy.js <walletAddress>
+ *   node getTokensAlchemy.js <walletAddress> [--ndjson]
+ * 
+ * --ndjson: stream one JSON object per line as results arrive
+ *   {"type":"native",...} then {"type":"token",...} per token, then {"type":"done",...}
  * 
  * Example:
  *   node getTokensAlchemy.js 0xb0079307d6143030D841CF0b9C4de42EB67119F2
@@ -139,8 +142,11 @@ function formatTokenBalance(balanceHex, decimals) {
 
 /**
  * Get complete wallet overview with all tokens
+ * onRow (optional) is called with each row as soon as it is known
  */
-async function getWalletTokens(walletAddress) {
+async function getWalletTokens(walletAddress, onRow = null) {
+  const emit = onRow || (() => {});
+
   console.error(`\n🔍 Fetching tokens via Alchemy Enhanced API...`);
   console.error(`📍 Wallet: ${walletAddress}`);
   console.error(`🔗 Network: Monad Testnet\n`);
@@ -158,6 +164,7 @@ async function getWalletTokens(walletAddress) {
     console.error(`⏳ Fetching native balance...`);
     results.native_balance = await getNativeBalance(walletAddress);
     console.error(`✅ Native: ${results.native_balance} MON`);
+    emit({ type: "native", native_balance: results.native_balance });
 
     // Step 2: Get all token balances in ONE call!
     console.error(`⏳ Fetching all ERC-20 token balances...`);
@@ -186,7 +193,7 @@ async function getWalletTokens(walletAddress) {
         return null;
       }
 
-      return {
+      const row = {
         address: token.contractAddress,
         symbol: metadata.symbol || "UNKNOWN",
         name: metadata.name || "Unknown Token",
@@ -194,6 +201,8 @@ async function getWalletTokens(walletAddress) {
         balance: formattedBalance,
         raw_balance: token.tokenBalance,
       };
+      emit({ type: "token", ...row });
+      return row;
     });
 
     const tokensWithMetadata = await Promise.all(metadataPromises);
@@ -228,15 +237,23 @@ async function main() {
   }
 
   const walletAddress = args[0];
+  const ndjson = args.includes("--ndjson");
 
   try {
-    const results = await getWalletTokens(walletAddress);
+    const emitRow = ndjson ? (row) => console.log(JSON.stringify(row)) : null;
+    const results = await getWalletTokens(walletAddress, emitRow);
 
     if (!results.ok) {
       console.error(`\n❌ Failed: ${results.error}`);
       process.exit(1);
     }
 
+    if (ndjson) {
+      console.log(JSON.stringify({ type: "done", ok: true, token_count: results.tokens.length }));
+      console.error(`\n✅ Success! Found ${results.tokens.length} tokens`);
+      return;
+    }
+
     // Output as JSON for easy parsing
     console.log(
       JSON.stringify(
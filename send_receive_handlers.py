@@ -3,8 +3,10 @@ Send & Receive Token Handlers
 Handles sending tokens to other addresses and receiving (show wallet address + QR)
 """
 import io
-import qrcode
+import time
+import segno
 from decimal import Decimal
+from functools import lru_cache
 from telegram import Update, InlineKeyboardButton, InlineKeyboardMarkup
 from telegram.ext import ContextTypes, ConversationHandler
 from telegram.constants import ParseMode
@@ -17,12 +19,62 @@ AWAITING_SEND_ADDRESS = 11
 AWAITING_SEND_AMOUNT = 12
 AWAITING_SEND_PASSPHRASE = 13
 
+# Seconds the token list fetched for the send keyboard is reused by the selection step
+TOKENS_SNAPSHOT_TTL = 30
+
+# MarkdownV2 special characters -> escaped form (single-pass str.translate table)
+_MD2_TRANS = str.maketrans({
+    char: f'\\{char}'
+    for char in ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
+})
+
+# Static MarkdownV2 message templates (pre-escaped - only str.format the dynamic, escaped values)
+_ADDRESS_PROMPT = (
+    "📤 *Send {sym}*\n\n"
+    "*Balance:* `{bal} {sym}`\n\n"
+    "Please send the *recipient address*\\.\n\n"
+    "Example: `0x1234\\.\\.\\.abcd`\n\n"
+    "Type /cancel to abort\\."
+)
+_AMOUNT_PROMPT = (
+    "📤 *Send {sym}*\n\n"
+    "*To:* `{to_head}...{to_tail}`\n\n"
+    "*Available Balance:* `{bal} {sym}`\n\n"
+    "How much {sym} do you want to send?\n\n"
+    "Example: `10` or `0\\.5`\n\n"
+    "Type /cancel to abort\\."
+)
+_TX_SUMMARY = (
+    "*Token:* {sym}\n"
+    "*Amount:* `{amount} {sym}`\n"
+    "*To:* `{to_head}...{to_tail}`\n"
+)
+_CONFIRM_TMPL = (
+    "✅ *Confirm Transaction*\n\n"
+    "{summary}\n"
+    "⏳ *Sending transaction\\.\\.\\.*"
+)
+_SENT_TMPL = (
+    "✅ *Transaction Sent\\!*\n\n"
+    "{summary}"
+    "*TX Hash:* `{tx_head}...`\n\n"
+    "🔗 [View Transaction]({tx_url})\n\n"
+    "⏰ Waiting for confirmation\\.\\.\\."
+)
+
+@lru_cache(maxsize=2048)
 def escape_markdown(text: str) -> str:
-    """Escape special characters for MarkdownV2"""
-    special_chars = ['_', '*', '[', ']', '(', ')', '~', '`', '>', '#', '+', '-', '=', '|', '{', '}', '.', '!']
-    for char in special_chars:
-        text = text.replace(char, f'\\{char}')
-    return text
+    """Escape special characters for MarkdownV2 (memoized - symbols and address slices repeat)"""
+    return text.translate(_MD2_TRANS)
+
+def _tx_summary(symbol: str, amount: Decimal, recipient: str) -> str:
+    """Token / amount / recipient lines shared by the confirm and sent messages"""
+    return _TX_SUMMARY.format(
+        sym=escape_markdown(symbol),
+        amount=escape_markdown(f'{amount:.4f}'),
+        to_head=escape_markdown(recipient[:10]),
+        to_tail=escape_markdown(recipient[-8:])
+    )
 
 async def handle_send_token(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
@@ -38,8 +90,9 @@ async def handle_send_token(update: Update, context: ContextTypes.DEFAULT_TYPE)
         await query.edit_message_text("❌ Wallet not found\\.", parse_mode=ParseMode.MARKDOWN_V2)
         return ConversationHandler.END
     
-    # Get all verified tokens with balance > 0
+    # Get all verified tokens with balance > 0 (kept briefly for the token selection step)
     all_tokens = blockchain_manager.get_wallet_all_tokens(user.wallet_address)
+    context.user_data['_tokens_snapshot'] = (time.monotonic(), all_tokens)
     
     sendable_tokens = {}
     for symbol, token_data in all_tokens.items():
@@ -90,8 +143,13 @@ async def handle_send_select_token(update: Update, context: ContextTypes.DEFAULT
     symbol = query.data.replace("send_select_", "")
     print(f"   Symbol extracted: {symbol}")
     
-    user = db_manager.get_user(user_id)
-    all_tokens = blockchain_manager.get_wallet_all_tokens(user.wallet_address)
+    # Reuse the balances just shown in the token keyboard if they are still fresh
+    snapshot = context.user_data.pop('_tokens_snapshot', None)
+    if snapshot and time.monotonic() - snapshot[0] < TOKENS_SNAPSHOT_TTL:
+        all_tokens = snapshot[1]
+    else:
+        user = db_manager.get_user(user_id)
+        all_tokens = blockchain_manager.get_wallet_all_tokens(user.wallet_address)
     
     if symbol not in all_tokens:
         await query.edit_message_text("❌ Token not found\\.", parse_mode=ParseMode.MARKDOWN_V2)
@@ -112,11 +170,7 @@ async def handle_send_select_token(update: Update, context: ContextTypes.DEFAULT
     
     # No passphrase needed - go directly to address input
     await query.edit_message_text(
-        f"📤 *Send {escape_markdown(symbol)}*\n\n"
-        f"*Balance:* `{escape_markdown(balance_str)} {escape_markdown(symbol)}`\n\n"
-        f"Please send the *recipient address*\\.\n\n"
-        f"Example: `0x1234\\.\\.\\.abcd`\n\n"
-        f"Type /cancel to abort\\.",
+        _ADDRESS_PROMPT.format(sym=escape_markdown(symbol), bal=escape_markdown(balance_str)),
         parse_mode=ParseMode.MARKDOWN_V2
     )
     return AWAITING_SEND_ADDRESS
@@ -128,8 +182,11 @@ async def handle_send_address_input(update: Update, context: ContextTypes.DEFAUL
     user_id = update.effective_user.id
     address = update.message.text.strip()
     
-    # Validate address format
-    if not address.startswith('0x') or len(address) != 42:
+    # Validate address format and checksum it once for the rest of the flow
+    checksum_address = None
+    if address.startswith('0x') and len(address) == 42:
+        checksum_address = blockchain_manager.checksum_address(address)
+    if not checksum_address:
         await update.message.reply_text(
             "❌ Invalid address format\\.\n\n"
             "Address must start with `0x` and be 42 characters long\\.\n\n"
@@ -139,6 +196,7 @@ async def handle_send_address_input(update: Update, context: ContextTypes.DEFAUL
         return AWAITING_SEND_ADDRESS
     
     # Store recipient address
+    address = checksum_address
     context.user_data['send_token']['recipient'] = address
     
     token = context.user_data['send_token']
@@ -146,12 +204,12 @@ async def handle_send_address_input(update: Update, context: ContextTypes.DEFAUL
     balance = token['balance']
     
     await update.message.reply_text(
-        f"📤 *Send {escape_markdown(symbol)}*\n\n"
-        f"*To:* `{escape_markdown(address[:10])}...{escape_markdown(address[-8:])}`\n\n"
-        f"*Available Balance:* `{escape_markdown(f'{balance:.4f}')} {escape_markdown(symbol)}`\n\n"
-        f"How much {escape_markdown(symbol)} do you want to send?\n\n"
-        f"Example: `10` or `0\\.5`\n\n"
-        f"Type /cancel to abort\\.",
+        _AMOUNT_PROMPT.format(
+            sym=escape_markdown(symbol),
+            to_head=escape_markdown(address[:10]),
+            to_tail=escape_markdown(address[-8:]),
+            bal=escape_markdown(f'{balance:.4f}')
+        ),
         parse_mode=ParseMode.MARKDOWN_V2
     )
     
@@ -198,11 +256,7 @@ async def handle_send_amount_input(update: Update, context: ContextTypes.DEFAULT
     
     # Show confirmation and execute immediately
     loading_msg = await update.message.reply_text(
-        f"✅ *Confirm Transaction*\n\n"
-        f"*Token:* {escape_markdown(symbol)}\n"
-        f"*Amount:* `{escape_markdown(f'{amount:.4f}')} {escape_markdown(symbol)}`\n"
-        f"*To:* `{escape_markdown(recipient[:10])}...{escape_markdown(recipient[-8:])}`\n\n"
-        f"⏳ *Sending transaction\\.\\.\\.*",
+        _CONFIRM_TMPL.format(summary=_tx_summary(symbol, amount, recipient)),
         parse_mode=ParseMode.MARKDOWN_V2
     )
     
@@ -215,51 +269,27 @@ async def handle_send_amount_input(update: Update, context: ContextTypes.DEFAULT
         token_address = token['address']
         
         # Send transaction
+        # Native MON and ERC20 share gas params, nonce cache and the async submit path
         if symbol in ['MON', 'MONAD']:
-            # Native MON transfer
-            from web3 import Web3
-            from config import GAS_PRICE_MODES
-            w3 = blockchain_manager.w3
-            
-            # Checksum addresses
-            checksum_from = Web3.to_checksum_address(user.wallet_address)
-            checksum_to = Web3.to_checksum_address(recipient)
-            
-            nonce = w3.eth.get_transaction_count(checksum_from)
-            
-            # Get gas settings
-            gas_settings = GAS_PRICE_MODES.get('normal', GAS_PRICE_MODES['normal'])
-            max_fee = w3.to_wei(gas_settings['maxFeePerGas'], 'gwei')
-            max_priority = w3.to_wei(gas_settings['maxPriorityFeePerGas'], 'gwei')
-            
-            tx = {
-                'from': checksum_from,
-                'nonce': nonce,
-                'to': checksum_to,
-                'value': w3.to_wei(amount, 'ether'),
-                'gas': 21000,
-                'maxFeePerGas': max_fee,
-                'maxPriorityFeePerGas': max_priority,
-                'chainId': w3.eth.chain_id
-            }
-            
-            signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-            tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            tx_hash_hex = tx_hash.hex()
+            result = await blockchain_manager.asend_native(
+                recipient_address=recipient,
+                amount=amount,
+                wallet_address=user.wallet_address,
+                private_key=private_key
+            )
         else:
-            # ERC20 token transfer
-            result = blockchain_manager.send_token(
+            result = await blockchain_manager.asend_token(
                 token_address=token_address,
                 recipient_address=recipient,
                 amount=amount,
                 wallet_address=user.wallet_address,
                 private_key=private_key
             )
-            
-            if not result:
-                raise Exception("Transaction failed")
-            
-            tx_hash_hex = result.get('tx_hash')
+        
+        if not result:
+            raise Exception("Transaction failed")
+        
+        tx_hash_hex = result.get('tx_hash')
         
         # Clear sensitive data
         del private_key
@@ -268,14 +298,10 @@ async def handle_send_amount_input(update: Update, context: ContextTypes.DEFAULT
         # Success message
         tx_url = f"{BLOCK_EXPLORER_URL}/tx/{tx_hash_hex}"
         
-        success_msg = (
-            f"✅ *Transaction Sent\\!*\n\n"
-            f"*Token:* {escape_markdown(symbol)}\n"
-            f"*Amount:* `{escape_markdown(f'{amount:.4f}')} {escape_markdown(symbol)}`\n"
-            f"*To:* `{escape_markdown(recipient[:10])}...{escape_markdown(recipient[-8:])}`\n"
-            f"*TX Hash:* `{escape_markdown(tx_hash_hex[:10])}...`\n\n"
-            f"🔗 [View Transaction]({tx_url})\n\n"
-            f"⏰ Waiting for confirmation\\.\\.\\."
+        success_msg = _SENT_TMPL.format(
+            summary=_tx_summary(symbol, amount, recipient),
+            tx_head=escape_markdown(tx_hash_hex[:10]),
+            tx_url=tx_url
         )
         
         await loading_msg.edit_text(
@@ -332,12 +358,9 @@ async def handle_send_passphrase_input(update: Update, context: ContextTypes.DEF
         
         await context.bot.send_message(
             chat_id=user_id,
-            text=f"✅ *Passphrase Verified\\!*\n\n"
-                 f"📤 *Send {escape_markdown(symbol)}*\n\n"
-                 f"*Balance:* `{escape_markdown(balance_str)} {escape_markdown(symbol)}`\n\n"
-                 f"Please send the *recipient address*\\.\n\n"
-                 f"Example: `0x1234\\.\\.\\.abcd`\n\n"
-                 f"Type /cancel to abort\\.",
+            text="✅ *Passphrase Verified\\!*\n\n" + _ADDRESS_PROMPT.format(
+                sym=escape_markdown(symbol), bal=escape_markdown(balance_str)
+            ),
             parse_mode=ParseMode.MARKDOWN_V2
         )
         
@@ -368,133 +391,14 @@ async def handle_send_passphrase_input(update: Update, context: ContextTypes.DEF
         )
         return ConversationHandler.END
 
-
-async def handle_send_passphrase_input_old(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
-    """
-    OLD: Handle passphrase and execute send transaction
-    """
-    user_id = update.effective_user.id
-    passphrase = update.message.text.strip()
-    
-    # Delete passphrase message for security
-    try:
-        await update.message.delete()
-    except:
-        pass
-    
-    loading_msg = await context.bot.send_message(
-        chat_id=user_id,
-        text="⏳ *Processing transaction\\.\\.\\.*",
-        parse_mode=ParseMode.MARKDOWN_V2
-    )
-    
-    try:
-        # Get private key with passphrase
-        private_key = db_manager.get_decrypted_private_key(
-            telegram_id=user_id,
-            passphrase=passphrase
-        )
-        
-        user = db_manager.get_user(user_id)
-        token = context.user_data['send_token']
-        
-        symbol = token['symbol']
-        token_address = token['address']
-        recipient = token['recipient']
-        amount = token['amount']
-        
-        # Send transaction
-        if symbol in ['MON', 'MONAD']:
-            # Native MON transfer
-            from web3 import Web3
-            from config import GAS_PRICE_MODES
-            w3 = blockchain_manager.w3
-            
-            # Checksum addresses
-            checksum_from = Web3.to_checksum_address(user.wallet_address)
-            checksum_to = Web3.to_checksum_address(recipient)
-            
-            nonce = w3.eth.get_transaction_count(checksum_from)
-            
-            # Get gas settings
-            gas_settings = GAS_PRICE_MODES.get('normal', GAS_PRICE_MODES['normal'])
-            max_fee = w3.to_wei(gas_settings['maxFeePerGas'], 'gwei')
-            max_priority = w3.to_wei(gas_settings['maxPriorityFeePerGas'], 'gwei')
-            
-            tx = {
-                'from': checksum_from,
-                'nonce': nonce,
-                'to': checksum_to,
-                'value': w3.to_wei(amount, 'ether'),
-                'gas': 21000,
-                'maxFeePerGas': max_fee,
-                'maxPriorityFeePerGas': max_priority,
-                'chainId': w3.eth.chain_id
-            }
-            
-            signed_tx = w3.eth.account.sign_transaction(tx, private_key)
-            tx_hash = w3.eth.send_raw_transaction(signed_tx.rawTransaction)
-            tx_hash_hex = tx_hash.hex()
-        else:
-            # ERC20 token transfer
-            result = blockchain_manager.send_token(
-                token_address=token_address,
-                recipient_address=recipient,
-                amount=amount,
-                wallet_address=user.wallet_address,
-                private_key=private_key
-            )
-            
-            if not result:
-                raise Exception("Transaction failed")
-            
-            tx_hash_hex = result.get('tx_hash')
-        
-        # Clear sensitive data
-        del private_key, passphrase
-        del context.user_data['send_token']
-        
-        # Success message
-        tx_url = f"{BLOCK_EXPLORER_URL}/tx/{tx_hash_hex}"
-        
-        success_msg = (
-            f"✅ *Transaction Sent\\!*\n\n"
-            f"*Token:* {escape_markdown(symbol)}\n"
-            f"*Amount:* `{escape_markdown(f'{amount:.4f}')} {escape_markdown(symbol)}`\n"
-            f"*To:* `{escape_markdown(recipient[:10])}...{escape_markdown(recipient[-8:])}`\n"
-            f"*TX Hash:* `{escape_markdown(tx_hash_hex[:10])}...`\n\n"
-            f"🔗 [View Transaction]({tx_url})\n\n"
-            f"⏰ Waiting for confirmation\\.\\.\\."
-        )
-        
-        await loading_msg.edit_text(
-            success_msg,
-            parse_mode=ParseMode.MARKDOWN_V2,
-            disable_web_page_preview=True
-        )
-        
-    except ValueError as e:
-        error_msg = str(e)
-        if "Incorrect passphrase" in error_msg or "Passphrase required" in error_msg:
-            await loading_msg.edit_text(
-                "❌ *Incorrect Passphrase\\!*\n\n"
-                "Transaction cancelled\\. Please try again\\.",
-                parse_mode=ParseMode.MARKDOWN_V2
-            )
-        else:
-            await loading_msg.edit_text(
-                f"❌ *Error\\!*\n\n"
-                f"{escape_markdown(error_msg)}",
-                parse_mode=ParseMode.MARKDOWN_V2
-            )
-    except Exception as e:
-        await loading_msg.edit_text(
-            f"❌ *Transaction Failed\\!*\n\n"
-            f"Error: {escape_markdown(str(e))}",
-            parse_mode=ParseMode.MARKDOWN_V2
-        )
+@lru_cache(maxsize=1024)
+def _render_qr_png(address: str) -> bytes:
+    """Render wallet address QR code as PNG bytes (addresses never change, so cache them)"""
+    qr = segno.make(address, error='m')
     
-    return ConversationHandler.END
+    bio = io.BytesIO()
+    qr.save(bio, kind='png', scale=10, border=5, dark='black', light='white')
+    return bio.getvalue()
 
 async def handle_receive_token(update: Update, context: ContextTypes.DEFAULT_TYPE) -> int:
     """
@@ -512,17 +416,8 @@ async def handle_receive_token(update: Update, context: ContextTypes.DEFAULT_TYP
     
     address = user.wallet_address
     
-    # Generate QR code
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr.add_data(address)
-    qr.make(fit=True)
-    
-    img = qr.make_image(fill_color="black", back_color="white")
-    
-    # Save to BytesIO
-    bio = io.BytesIO()
-    img.save(bio, 'PNG')
-    bio.seek(0)
+    # QR code PNG (cached per address)
+    bio = io.BytesIO(_render_qr_png(address))
     
     # Message text
     message_text = (